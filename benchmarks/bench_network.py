@@ -0,0 +1,99 @@
+"""
+Load test offline untuk jalur yang bergantung pada jaringan.
+
+Cassette yfinance dibuat dari panel harga sintetis, lalu diputar ulang lewat
+stub server lokal dengan latency, error 500 dan 429 yang bisa diatur:
+
+    python -m benchmarks.bench_network --tickers 200 --latency 0.05 --error-rate 0.02 --rate-429 0.05
+    python -m benchmarks.bench_network --tickers 200 --workers 8 --max-rps 50
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+from benchmarks.synthetic import generate_price_panel
+from utils import transport
+from utils.stub_server import start_stub_server
+from utils.stock_analysis import fetch_stock_data
+
+
+def seed_yfinance_cassette(cassette_dir, n_tickers, years, period="6y"):
+    panel = generate_price_panel(n_tickers, years)
+    index = pd.to_datetime(panel.index, format="%d-%m-%Y").tz_localize("Asia/Jakarta")
+    for kode in panel.columns:
+        history = panel[[kode]].rename(columns={kode: "Close"}).set_index(index).dropna()
+        transport.save_response(f"yfinance://history/{kode}.JK", 200, transport.encode_history(history),
+                                "application/json", {"period": period}, cassette_dir=cassette_dir)
+    return list(panel.columns)
+
+
+def bench_sequential(kode_list, period):
+    kode_df = pd.DataFrame({"Kode": kode_list})
+    start = time.perf_counter()
+    data = fetch_stock_data(kode_df, period=period)
+    elapsed = time.perf_counter() - start
+    return elapsed, data.shape[1]
+
+
+def bench_parallel(kode_list, period, workers):
+    def fetch(kode):
+        response = transport.get(f"yfinance://history/{kode}.JK", params={"period": period})
+        return response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        statuses = list(pool.map(fetch, kode_list))
+    elapsed = time.perf_counter() - start
+    return elapsed, pd.Series(statuses).value_counts().to_dict()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tickers", type=int, default=100)
+    parser.add_argument("--years", type=int, default=6)
+    parser.add_argument("--workers", type=int, default=8, help="jumlah thread untuk fetch paralel")
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--max-rps", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    period = "6y"
+    with tempfile.TemporaryDirectory() as cassette_dir:
+        kode_list = seed_yfinance_cassette(cassette_dir, args.tickers, args.years, period)
+        stub_config = dict(latency=args.latency, jitter=args.jitter, error_rate=args.error_rate,
+                           rate_429=args.rate_429, max_rps=args.max_rps, seed=args.seed)
+
+        server = start_stub_server(cassette_dir, **stub_config)
+        transport.configure(mode="replay", cassette_dir=cassette_dir, stub_url=server.url)
+        try:
+            elapsed, n_ok = bench_sequential(kode_list, period)
+            print(f"fetch_stock_data (sekuensial): {elapsed:7.3f}s, {len(kode_list) / elapsed:7.1f} req/s, "
+                  f"{n_ok}/{len(kode_list)} kode berhasil")
+            print(f"   stub: {server.stats}")
+        finally:
+            server.stop()
+
+        server = start_stub_server(cassette_dir, **stub_config)
+        transport.configure(stub_url=server.url)
+        try:
+            elapsed, statuses = bench_parallel(kode_list, period, args.workers)
+            print(f"transport.get ({args.workers} thread):     {elapsed:7.3f}s, "
+                  f"{len(kode_list) / elapsed:7.1f} req/s, status {statuses}")
+            print(f"   stub: {server.stats}")
+        finally:
+            server.stop()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
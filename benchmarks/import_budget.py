@@ -0,0 +1,121 @@
+"""
+Cek waktu import (cold start) setiap halaman dengan `python -X importtime`.
+
+Untuk setiap halaman, semua statement import top-level dijalankan di proses
+Python baru setelah lantai `import streamlit, pandas` (dipakai semua halaman)
+di proses yang sama. Yang di-budget hanya waktu import di atas lantai itu,
+jadi waktu load streamlit/pandas yang sangat bergantung pada mesin tidak ikut.
+Gagal (exit code 1) jika:
+
+  * selisih waktu import melebihi budget di import_budget.json, atau
+  * library berat (yfinance, plotly, bs4, ...) ikut ter-load saat import halaman.
+
+Hanya statement import yang diputar ulang. Kode top-level lain tidak diukur,
+misalnya `pd.read_excel(...)` di halaman Annual Reports Downloaders yang
+me-load openpyxl saat render pertama.
+
+    python -m benchmarks.import_budget
+    python -m benchmarks.import_budget --update    # tulis ulang budget dari hasil saat ini
+"""
+import argparse
+import ast
+import glob
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BUDGET_FILE = os.path.join(os.path.dirname(__file__), "import_budget.json")
+
+# Library yang hanya boleh di-load di dalam fungsi yang memakainya
+HEAVY_MODULES = ["yfinance", "plotly", "bs4", "openpyxl", "tqdm", "tkinter", "xlsxwriter",
+                 "requests", "pyinstrument"]
+
+
+def page_files():
+    return ["Home.py"] + sorted(os.path.relpath(p, ROOT) for p in glob.glob(os.path.join(ROOT, "pages", "*.py")))
+
+
+FLOOR_CODE = "import streamlit\nimport pandas"
+# Penanda di stderr: baris importtime sebelumnya milik lantai, sesudahnya milik halaman
+MARKER = "-- fiber import budget: akhir lantai --"
+
+
+def top_level_imports(path: str) -> str:
+    with open(os.path.join(ROOT, path), encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    nodes = [n for n in tree.body if isinstance(n, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(n) for n in nodes)
+
+
+def measure(path: str):
+    """
+    Kembalikan (selisih_ms, lantai_ms, modul yang ter-load setelah lantai).
+    Lantai dan halaman diukur di proses yang sama, dipisah oleh MARKER.
+    """
+    code = f"{FLOOR_CODE}\nimport sys\nsys.stderr.write({MARKER!r} + '\\n')\n{top_level_imports(path)}"
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", code], cwd=ROOT,
+                          capture_output=True, text=True)
+    if proc.returncode != 0:
+        raise RuntimeError(f"Import {path} gagal:\n{proc.stderr[-2000:]}")
+
+    totals_us, loaded, after_floor = [0, 0], [], False
+    for line in proc.stderr.splitlines():
+        if line == MARKER:
+            after_floor = True
+            continue
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = [part.strip() for part in line[len("import time:"):].split("|")]
+        if after_floor:
+            loaded.append(name)
+        if not line.split("|")[2].startswith("  "):
+            totals_us[after_floor] += int(cumulative)
+    return totals_us[1] / 1000, totals_us[0] / 1000, loaded
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="ambil waktu terkecil dari N percobaan")
+    parser.add_argument("--update", action="store_true", help="tulis budget baru = selisih x --headroom")
+    parser.add_argument("--headroom", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    budget = {}
+    if os.path.exists(BUDGET_FILE):
+        with open(BUDGET_FILE) as f:
+            budget = json.load(f)
+
+    failures, results = [], {}
+    for path in page_files():
+        runs = [measure(path) for _ in range(args.repeat)]
+        extra_ms = min(r[0] for r in runs)
+        floor_ms = min(r[1] for r in runs)
+        heavy = sorted({m.split(".")[0] for m in runs[0][2]} & set(HEAVY_MODULES))
+        results[path] = round(extra_ms, 1)
+
+        limit = budget.get(path)
+        status = "OK"
+        if heavy:
+            status = f"GAGAL: library berat ter-load {heavy}"
+            failures.append(path)
+        elif limit is not None and extra_ms > limit and not args.update:
+            status = f"GAGAL: melebihi budget +{limit} ms"
+            failures.append(path)
+        print(f"{path:<40} +{extra_ms:7.1f} ms di atas lantai {floor_ms:6.1f} ms  "
+              f"(budget +{limit if limit is not None else '-'})  {status}")
+
+    if args.update:
+        # Budget minimal 50 ms agar noise kecil tidak langsung dianggap regresi
+        new_budget = {path: round(max(ms * args.headroom, 50.0)) for path, ms in results.items()}
+        with open(BUDGET_FILE, "w") as f:
+            json.dump(new_budget, f, indent=2)
+            f.write("\n")
+        print(f"Budget disimpan di {BUDGET_FILE}")
+
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
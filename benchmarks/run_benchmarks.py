@@ -0,0 +1,206 @@
+"""
+Benchmark offline untuk jalur data utama.
+
+Jalankan dari root repo:
+
+    python -m benchmarks.run_benchmarks                     # skala small,medium
+    python -m benchmarks.run_benchmarks --scales large --save
+    python -m benchmarks.run_benchmarks --compare           # bandingkan dengan baseline
+
+Semua input dibuat secara sintetis, jadi tidak butuh jaringan.
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# Progress bar tqdm hanya mengganggu output benchmark
+os.environ.setdefault("TQDM_DISABLE", "1")
+
+from benchmarks.synthetic import generate_xbrl_folder, generate_price_panel, generate_commodity_series
+from utils.stock_analysis import (
+    analyze_data, export_status_excel, window_statistics, status_tables, merge_latest, status_delta,
+)
+from utils.screener import compute_indicators, apply_filters
+from utils.correlation import commodity_sensitivity, rank_sensitivity
+from utils import panel_store, financial_reports
+from utils.financial_reports import (
+    file_info_scraper, xbrl_scraper, gabungkan_data, general_information, export_report,
+    extract_statement, _extract_generic,
+)
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+# Jumlah file XBRL dan ukuran panel harga (kode x tahun) per skala
+SCALES = {
+    "small": {"files": 8, "accounts": 40, "tickers": 100, "years": 2},
+    "medium": {"files": 40, "accounts": 80, "tickers": 400, "years": 6},
+    "large": {"files": 150, "accounts": 150, "tickers": 900, "years": 6},
+}
+
+
+def timed(fn, *args, repeat=1, **kwargs):
+    best, result = None, None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def bench_financial_reports(cfg, workdir):
+    source_dir = generate_xbrl_folder(os.path.join(workdir, "xbrl"), cfg["files"], cfg["accounts"])
+    output_dir = os.path.join(workdir, "out")
+    os.makedirs(output_dir, exist_ok=True)
+    results = {}
+
+    results["file_info_scraper"], data = timed(file_info_scraper, source_dir)
+
+    elapsed = 0.0
+    for kolom in ("NamaSheetPK", "NamaSheetLR", "NamaSheetAK"):
+        t, _ = timed(xbrl_scraper, data[kolom].unique(), kolom, source_dir, output_dir, data=data)
+        elapsed += t
+    results["xbrl_scraper"] = elapsed
+
+    # Ekstraksi satu sheet per file: jalur lama (read_excel + transpose) vs rencana template.
+    # Cold: cache plan dikosongkan dulu sehingga kompilasi plan ikut terukur; warm: plan sudah ada.
+    pairs = [(os.path.join(source_dir, r.NamaFile), r.NamaSheetPK) for r in data.itertuples()]
+    results["extract_generic"], _ = timed(lambda: [_extract_generic(*pair) for pair in pairs])
+    financial_reports._plans.clear()
+    results["extract_plan_cold"], _ = timed(lambda: [extract_statement(*pair) for pair in pairs])
+    results["extract_plan_warm"], _ = timed(lambda: [extract_statement(*pair) for pair in pairs])
+
+    elapsed, laporan = 0.0, {}
+    for kolom in ("NamaSheetPK", "NamaSheetLR", "NamaSheetAK"):
+        t, laporan[kolom] = timed(gabungkan_data, data[kolom].unique(), output_dir)
+        elapsed += t
+    results["gabungkan_data"] = elapsed
+
+    results["general_information"], general_info = timed(general_information, source_dir, data)
+
+    latest_stock = pd.DataFrame({"kode entitas": data["kode entitas"].unique(), "penutupan": 1000})
+    results["export_report"], _ = timed(
+        export_report, os.path.join(output_dir, "Data_Laporan.xlsx"), general_info,
+        laporan["NamaSheetPK"], laporan["NamaSheetLR"], laporan["NamaSheetAK"], latest_stock,
+    )
+    return results
+
+
+def bench_stock_analysis(cfg, repeat):
+    panel = generate_price_panel(cfg["tickers"], cfg["years"])
+    results = {}
+    results["analyze_data"], analysis = timed(analyze_data, panel, repeat=repeat)
+    results["export_status_excel"], _ = timed(export_status_excel, analysis, repeat=repeat)
+
+    stats = window_statistics(panel)
+    latest = (stats["Now"] * np.random.default_rng(0).uniform(0.95, 1.05, len(stats))).round()
+    results["intraday_refresh"], _ = timed(_intraday_cycle, stats, latest, repeat=repeat)
+    results["compute_indicators"], indicators = timed(compute_indicators, panel, repeat=repeat)
+    results["apply_filters"], _ = timed(
+        apply_filters, indicators, [("RSI14", "<", 30), ("Now", ">", "MA200"), ("Drawdown %", "<=", -30)],
+        repeat=repeat,
+    )
+
+    commodities = generate_commodity_series(["Gold", "Nickel", "Copper"], cfg["years"])
+    results["commodity_sensitivity"], hasil = timed(commodity_sensitivity, panel, commodities, repeat=repeat)
+    results["rank_sensitivity"], _ = timed(rank_sensitivity, hasil, repeat=repeat)
+
+    with tempfile.TemporaryDirectory() as store_dir:
+        results["panel_store_publish"], _ = timed(panel_store.publish, panel, {}, store_dir)
+        results["panel_store_load"], mapped = timed(_load_mapped, store_dir, repeat=repeat)
+        results["analyze_data_mmap"], _ = timed(analyze_data, mapped, repeat=repeat)
+        del mapped
+        panel_store._mapped.clear()
+    return results
+
+
+def _intraday_cycle(stats, latest):
+    # Satu siklus refresh intraday tanpa jaringan: gabung quote, hitung delta dan tabel status
+    now_baru = merge_latest(stats["Now"], latest)
+    return status_delta(stats, stats["Now"], now_baru), status_tables(stats, now_baru)
+
+
+def _load_mapped(store_dir):
+    # Buang mapping yang sudah di-cache agar yang diukur adalah pembukaan dari disk
+    panel_store._mapped.clear()
+    return panel_store.load_current(store_dir).frame()
+
+
+def run(scales, repeat):
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "results": {},
+    }
+    for scale in scales:
+        cfg = SCALES[scale]
+        print(f"== {scale}: {cfg}")
+        with tempfile.TemporaryDirectory() as workdir:
+            results = bench_financial_reports(cfg, workdir)
+        results.update(bench_stock_analysis(cfg, repeat))
+        for name, seconds in results.items():
+            print(f"   {name:<22} {seconds:8.3f}s")
+        report["results"][scale] = {k: round(v, 4) for k, v in results.items()}
+    return report
+
+
+def compare(report, baseline, threshold):
+    regressions = []
+    for scale, results in report["results"].items():
+        base = baseline.get("results", {}).get(scale, {})
+        for name, seconds in results.items():
+            if name not in base or not base[name]:
+                continue
+            ratio = seconds / base[name]
+            flag = "REGRESI" if ratio > 1 + threshold else ""
+            print(f"   {scale:<7} {name:<22} {base[name]:8.3f}s -> {seconds:8.3f}s  x{ratio:5.2f} {flag}")
+            if flag:
+                regressions.append((scale, name, ratio))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", default="small,medium", help="daftar skala: " + ",".join(SCALES))
+    parser.add_argument("--repeat", type=int, default=3, help="pengulangan untuk benchmark in-memory")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--save", action="store_true", help="simpan hasil sebagai baseline")
+    parser.add_argument("--compare", action="store_true", help="bandingkan dengan baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="batas regresi (0.25 = +25%%)")
+    args = parser.parse_args(argv)
+
+    scales = [s.strip() for s in args.scales.split(",") if s.strip()]
+    unknown = [s for s in scales if s not in SCALES]
+    if unknown:
+        parser.error(f"skala tidak dikenal: {unknown}")
+
+    report = run(scales, args.repeat)
+
+    if args.compare:
+        if not os.path.exists(args.baseline):
+            print(f"Baseline {args.baseline} belum ada, jalankan dengan --save terlebih dahulu.")
+            return 1
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+
+    if args.save:
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"Baseline disimpan di {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,125 @@
+import os
+import numpy as np
+import pandas as pd
+from openpyxl import Workbook
+
+# =========================================================
+# Generator data sintetis (tanpa jaringan)
+# =========================================================
+# Template sheet meniru kode sheet IDX: (PK, LR, AK) per jenis industri
+TEMPLATES = [
+    ("1210000", "1311000", "1510000"),  # umum
+    ("2210000", "2311000", "2510000"),  # properti
+    ("3210000", "3311000", "3510000"),  # keuangan
+    ("4210000", "4311000", "4510000"),  # asuransi
+]
+
+JUDUL = {
+    "PK": ("Laporan posisi keuangan", "Statement of financial position"),
+    "LR": ("Laporan laba rugi dan penghasilan komprehensif lain",
+           "Statement of profit or loss and other comprehensive income"),
+    "AK": ("Laporan arus kas", "Statement of cash flows"),
+}
+
+GENERAL_INFO = [
+    ("Informasi umum", "General information"),
+    ("Periode", "Period"),
+    ("Nama entitas", "Entity name"),
+    ("Kode entitas", "Entity code"),
+    ("Sektor", "Sector"),
+    ("Subsektor", "Subsector"),
+    ("Tanggal awal periode berjalan", "Current period start date"),
+    ("Tanggal akhir periode berjalan", "Current period end date"),
+    ("Mata uang pelaporan", "Reporting currency"),
+    ("Pembulatan yang digunakan", "Level of rounding used"),
+]
+
+
+def template_accounts(jenis: str, template_idx: int, n_accounts: int) -> list:
+    return [
+        (f"Akun {jenis} {template_idx}-{i}", f"Account {jenis} {template_idx}-{i}")
+        for i in range(n_accounts)
+    ]
+
+
+def kode_entitas(i: int) -> str:
+    huruf = "ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+    return "".join(huruf[(i // 26 ** k) % 26] for k in range(3, -1, -1))
+
+
+def _write_statement_sheet(wb, sheet_code, jenis, accounts, tahun, rng):
+    ws = wb.create_sheet(sheet_code)
+    judul_id, judul_en = JUDUL[jenis]
+    ws.append([f"[{sheet_code}] {judul_id}", None, None, f"[{sheet_code}] {judul_en}"])
+    ws.append([judul_id, None, None, judul_en])
+    ws.append(["Periode", None, None, "Period"])
+    ws.append(["Tanggal akhir periode", f"{tahun}-12-31", f"{tahun - 1}-12-31", "Period end date"])
+    for j, (label_id, label_en) in enumerate(accounts):
+        if j % 10 == 0:
+            # Baris abstract tanpa nilai, dibuang oleh xbrl_scraper
+            ws.append([f"{label_id} [abstract]", None, None, f"{label_en} [abstract]"])
+            continue
+        now, prev = rng.integers(-10 ** 9, 10 ** 12, size=2)
+        ws.append([label_id, int(now), int(prev), label_en])
+
+
+def write_financial_statement(path, kode, tahun, template_idx, n_accounts, rng):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = "1000000"
+    ws.append(["[1000000] Informasi umum", None, "[1000000] General information"])
+    values = [None, "Tahunan", f"PT {kode} Tbk", kode, "Sektor", "Subsektor",
+              f"{tahun}-01-01", f"{tahun}-12-31", "IDR", "Jutaan"]
+    for (label_id, label_en), value in zip(GENERAL_INFO, values):
+        ws.append([label_id, value, label_en])
+
+    for jenis, sheet_code in zip(("PK", "LR", "AK"), TEMPLATES[template_idx % len(TEMPLATES)]):
+        accounts = template_accounts(jenis, template_idx, n_accounts)
+        _write_statement_sheet(wb, sheet_code, jenis, accounts, tahun, rng)
+
+    wb.save(path)
+
+
+def generate_xbrl_folder(folder, n_files, n_accounts=60, n_templates=4, tahun=2024, seed=0):
+    """
+    Buat folder berisi file FinancialStatement-*.xlsx sintetis berbentuk IDX.
+    """
+    os.makedirs(folder, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    for i in range(n_files):
+        kode = kode_entitas(i)
+        path = os.path.join(folder, f"FinancialStatement-{tahun}-Tahunan-{kode}.xlsx")
+        write_financial_statement(path, kode, tahun, i % n_templates, n_accounts, rng)
+    return folder
+
+
+def generate_price_panel(n_tickers, years, seed=0, end="2025-12-31"):
+    """
+    Panel harga lebar (tanggal x kode) dengan format yang sama seperti fetch_stock_data.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(end=end, periods=int(252 * years))
+    returns = rng.normal(0.0003, 0.02, size=(len(dates), n_tickers))
+    start_prices = rng.uniform(50, 20000, size=n_tickers)
+    prices = np.round(start_prices * np.exp(np.cumsum(returns, axis=0)))
+
+    # Sebagian saham baru listing, jadi awal datanya kosong
+    listing = rng.integers(0, len(dates) // 2, size=n_tickers)
+    listing[rng.random(n_tickers) < 0.7] = 0
+    prices[np.arange(len(dates))[:, None] < listing[None, :]] = np.nan
+
+    panel = pd.DataFrame(prices, index=dates, columns=[kode_entitas(i) for i in range(n_tickers)])
+    panel.index = panel.index.strftime("%d-%m-%Y")
+    return panel
+
+
+def generate_commodity_series(names, years, seed=0, end="2025-12-31") -> dict:
+    """
+    Seri harga harian komoditas (termasuk akhir pekan) seperti hasil fetch_timeseries.
+    """
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range(end=end, periods=int(365 * years), freq="D")
+    return {
+        name: pd.DataFrame({"date": dates, "Price": 1000 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))})
+        for name in names
+    }
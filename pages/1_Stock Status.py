@@ -1,136 +1,152 @@
 import streamlit as st
 import pandas as pd
-import yfinance as yf
-from datetime import datetime
-from io import BytesIO
+from utils import instrumentation, charts, shared_cache, panel_store
+from utils.stock_analysis import (
+    load_stock_list, fetch_stock_data, window_statistics, status_tables, export_status_excel,
+    fetch_latest_prices, market_open, merge_latest, status_delta,
+)
+from utils.screener import compute_indicators, apply_filters
 
 # =========================================================
-# 1. Fungsi utilitas
+# Streamlit Dashboard
 # =========================================================
-def load_stock_list(filepath: str) -> pd.DataFrame:
-    return pd.read_excel(filepath)
-
-def fetch_stock_data(kode_saham: pd.DataFrame, period: str = "6y", progress_callback=None) -> pd.DataFrame:
-    kode_list = (kode_saham['Kode'] + ".JK").to_list()
-    total = len(kode_list)
-    data_combined = pd.DataFrame()
-
-    for i, kode in enumerate(kode_list, 1):
-        try:
-            ticker = yf.Ticker(kode)
-            data = ticker.history(period=period)['Close'].round()
-            data = data.to_frame(name=kode.replace(".JK", ""))
-            if data_combined.empty:
-                data_combined = data
-            else:
-                data_combined = data_combined.join(data, how='outer')
-        except Exception:
-            pass  # Lewati saham yang gagal diambil
-        if progress_callback:
-            progress_callback(i / total)
-
-    # Format tanggal agar lebih rapi (dd-mm-yyyy)
-    data_combined.index = data_combined.index.strftime("%d-%m-%Y")
-    return data_combined
-
-def filter_data_by_years(data: pd.DataFrame, years: int) -> pd.DataFrame:
-    # Konversi index kembali ke datetime untuk perhitungan
-    data.index = pd.to_datetime(data.index, format="%d-%m-%Y")
-    latest_date = data.index.max()
-    cutoff_date = latest_date - pd.DateOffset(years=years)
-    subset = data[data.index >= cutoff_date]
-    valid_cols = (
-        subset[subset.index.year == cutoff_date.year]
-        .dropna(axis=1, how="all")
-        .columns.to_list()
-    )
-    subset.index = subset.index.strftime("%d-%m-%Y")
-    return subset[valid_cols]
-
-def compute_statistics(data: pd.DataFrame, label: str) -> dict:
-    return {
-        f"Max {label}": data.max(),
-        f"Min {label}": data.min(),
-        f"Mean {label}": data.mean().round()
-    }
-
-def combine_with_current(data_stats: dict, harga_sekarang: pd.DataFrame) -> pd.DataFrame:
-    frames = [df.to_frame(name=col_name) for col_name, df in data_stats.items()]
-    combined = pd.concat(frames + [harga_sekarang], axis=1)
-    return combined
-
-def check_status(row, period_label: str):
-    now = row["Now"]
-    value_5 = row.get(f"{period_label} 5 Years")
-    value_3 = row.get(f"{period_label} 3 Years")
-    value_1 = row.get(f"{period_label} 1 Years")
-    if pd.notna(value_5) and now < value_5:
-        return f"Lower than 5 years {period_label.lower()}"
-    elif pd.notna(value_3) and now < value_3:
-        return f"Lower than 3 years {period_label.lower()}"
-    elif pd.notna(value_1) and now < value_1:
-        return f"Lower than 1 year {period_label.lower()}"
-    else:
+st.set_page_config(page_title="📊 Stock Analyzer Dashboard", layout="wide")
+st.title("📈 Stock Analyzer Dashboard")
+
+stock_file = "database/Daftar Saham.xlsx"
+diag_options = instrumentation.diagnostics_options()
+
+# Panel harga dan hasil analisis dibagi ke semua sesi dalam proses ini.
+# Harga yang umurnya kurang dari PRICE_MAX_AGE dipakai ulang tanpa fetch ulang.
+# Panelnya sendiri disimpan di panel_store (memory-mapped), jadi proses lain
+# memakai mapping read-only yang sama, bukan salinan DataFrame masing-masing.
+PERIOD = "6y"
+PRICE_MAX_AGE = 30 * 60
+ANALYSIS_PARAMS = ("analyze_data", (1, 3, 5), ("Max", "Min", "Mean"))
+SCREENER_PARAMS = {"ma_windows": (20, 50, 200), "rsi_period": 14, "vol_window": 20}
+cache = shared_cache.get_shared_cache()
+panel_key = ("price_panel", shared_cache.file_fingerprint(stock_file), PERIOD)
+panel_meta = {"source": panel_key[1], "period": PERIOD}
+
+
+def published_panel():
+    # Versi terbaru yang dipublikasikan proses mana pun, selama sumber dan umurnya cocok
+    shared = panel_store.load_current()
+    if shared is None or any(shared.meta.get(k) != v for k, v in panel_meta.items()):
+        return None
+    if pd.Timestamp.now().timestamp() - shared.created_at > PRICE_MAX_AGE:
         return None
+    return shared
 
 
-# =========================================================
-# 2. Fungsi utama analisis
-# =========================================================
-def analyze_data(data: pd.DataFrame):
-    data_ff = data.ffill()
-    latest_date = pd.to_datetime(data_ff.index, format="%d-%m-%Y").max()
-    harga_sekarang = data_ff.loc[data_ff.index == latest_date.strftime("%d-%m-%Y")].T
-    harga_sekarang.columns = ["Now"]
-
-    data_1y = filter_data_by_years(data_ff.copy(), 1)
-    data_3y = filter_data_by_years(data_ff.copy(), 3)
-    data_5y = filter_data_by_years(data_ff.copy(), 5)
-
-    stats_1y = compute_statistics(data_1y, "1 Years")
-    stats_3y = compute_statistics(data_3y, "3 Years")
-    stats_5y = compute_statistics(data_5y, "5 Years")
-
-    result = {}
-    for label in ["Max", "Min", "Mean"]:
-        combined = combine_with_current(
-            {
-                f"{label} 1 Years": stats_1y[f"{label} 1 Years"],
-                f"{label} 3 Years": stats_3y[f"{label} 3 Years"],
-                f"{label} 5 Years": stats_5y[f"{label} 5 Years"],
-            },
-            harga_sekarang,
-        )
-        combined["Status"] = combined.apply(check_status, axis=1, period_label=label)
-        combined = combined.dropna(subset=["Status"])
-        result[label] = combined
-
-    return result
+def cached_panel():
+    # Entry cache proses ini, diganti versi publish terbaru bila proses lain sudah refresh.
+    # Umur entry dihitung dari waktu publish, bukan waktu diadopsi proses ini.
+    entry = cache.get(panel_key, max_age=PRICE_MAX_AGE)
+    if entry is not None and entry.value.version == panel_store.current_version():
+        return entry
+    published = published_panel()
+    if published is not None and (entry is None or published.version != entry.value.version):
+        return cache.put(panel_key, published, created_at=published.created_at)
+    return entry
 
 
-# =========================================================
-# 3. Streamlit Dashboard
-# =========================================================
-st.set_page_config(page_title="📊 Stock Analyzer Dashboard", layout="wide")
-st.title("📈 Stock Analyzer Dashboard")
+def load_price_panel(kode_df, progress_callback):
+    shared = published_panel()
+    if shared is None:
+        panel = fetch_stock_data(kode_df, period=PERIOD, progress_callback=progress_callback)
+        shared = panel_store.publish(panel, panel_meta)
+    return shared
+
+
+def shared_value(name, params, compute):
+    # Hasil turunan panel dibagi antar sesi selama versi datanya sama
+    if st.session_state.data_version is None:
+        return compute()
+    return cache.get_or_compute((name, st.session_state.data_version, params), compute).value
+
+
+def intraday_status(option):
+    # Dijalankan sebagai fragment: hanya bagian ini yang diulang setiap interval.
+    # Statistik window tetap dari analisis penuh, yang diperbarui hanya harga Now.
+    stats = st.session_state.window_stats
+    now_lama = st.session_state.intraday_now
+    if now_lama is None:
+        now_lama = stats["Now"]
+
+    refresh_sekarang = st.button("🔄 Refresh sekarang", key="intraday_refresh")
+    if refresh_sekarang or market_open():
+        with instrumentation.run("intraday_refresh", diag_options["track_memory"], diag_options["profiler"]) as metrics:
+            with instrumentation.span("fetch_latest_prices"):
+                latest = fetch_latest_prices(stats.index.to_list())
+            with instrumentation.span("status_delta"):
+                now_baru = merge_latest(now_lama, latest)
+                delta = status_delta(stats, now_lama, now_baru)
+        instrumentation.record_run(metrics, diag_options)
+        st.session_state.intraday_now = now_baru
+        st.session_state.intraday_checked_at = pd.Timestamp.now(tz="Asia/Jakarta")
+        if not delta.empty:
+            st.session_state.intraday_delta = delta
+    else:
+        st.info("Bursa sedang tutup. Refresh otomatis berjalan lagi pada jam perdagangan.")
+
+    if st.session_state.intraday_checked_at is not None:
+        st.caption(f"Harga terakhir dicek {st.session_state.intraday_checked_at:%H:%M:%S} WIB")
+    delta = st.session_state.intraday_delta
+    if delta is not None:
+        st.markdown("**Perubahan status terakhir**")
+        st.dataframe(delta[delta["Tipe"] == option], use_container_width=True, hide_index=True)
+
+    live_analysis = status_tables(stats, st.session_state.intraday_now)
+    st.dataframe(live_analysis[option])
 
-stock_file = "database/Daftar Saham.xlsx"
 
 if "data_saham" not in st.session_state:
     st.session_state.data_saham = None
+if "data_version" not in st.session_state:
+    st.session_state.data_version = None
+    st.session_state.data_fetched_at = None
 if "analysis" not in st.session_state:
     st.session_state.analysis = None
+    st.session_state.window_stats = None
+if "intraday_now" not in st.session_state:
+    st.session_state.intraday_now = None
+    st.session_state.intraday_checked_at = None
+    st.session_state.intraday_delta = None
+
+# Sesi baru langsung memakai panel yang sudah diambil sesi lain
+if st.session_state.data_saham is None:
+    shared_panel = cached_panel()
+    if shared_panel is not None:
+        st.session_state.data_saham = shared_panel.value.frame()
+        st.session_state.data_version = shared_panel.version
+        st.session_state.data_fetched_at = shared_panel.created_at
 
 # Tombol ambil data
 st.subheader("1️⃣ Ambil Data Saham dari Yahoo Finance")
 get_data_btn = st.button("📥 Get Stock Price")
 
 if get_data_btn and stock_file is not None:
-    kode_df = load_stock_list(stock_file)
-    progress_bar = st.progress(0)
-    with st.spinner("Mengambil data harga saham dari Yahoo Finance..."):
-        data_saham = fetch_stock_data(kode_df, progress_callback=progress_bar.progress)
-        st.session_state.data_saham = data_saham
+    with instrumentation.run("get_stock_price", diag_options["track_memory"], diag_options["profiler"]) as metrics:
+        with instrumentation.span("load_stock_list"):
+            kode_df = load_stock_list(stock_file)
+        progress_bar = st.progress(0)
+        with st.spinner("Mengambil data harga saham dari Yahoo Finance..."):
+            with instrumentation.span("fetch_stock_data"):
+                shared_panel = cached_panel() or cache.get_or_compute(
+                    panel_key,
+                    lambda: load_price_panel(kode_df, progress_bar.progress),
+                    max_age=PRICE_MAX_AGE,
+                    created_at=lambda shared: shared.created_at,
+                )
+            st.session_state.data_saham = shared_panel.value.frame()
+            st.session_state.data_version = shared_panel.version
+            st.session_state.data_fetched_at = shared_panel.created_at
+            st.session_state.analysis = None
+            st.session_state.window_stats = None
+            st.session_state.intraday_now = None
+            st.session_state.intraday_delta = None
+    instrumentation.record_run(metrics, diag_options)
     progress_bar.progress(1.0)
     st.success("✅ Data saham berhasil diambil!")
 
@@ -138,6 +154,9 @@ if get_data_btn and stock_file is not None:
 st.subheader("2️⃣ Data Saham yang Diambil")
 if st.session_state.data_saham is not None:
     st.dataframe(st.session_state.data_saham.tail(10))
+    if st.session_state.data_fetched_at is not None:
+        fetched_at = pd.Timestamp(st.session_state.data_fetched_at, unit="s", tz="Asia/Jakarta")
+        st.caption(f"Data versi {st.session_state.data_version}, diambil {fetched_at:%d-%m-%Y %H:%M} WIB")
 else:
     st.info("Belum ada data saham yang diambil. Tekan tombol Get Stock Price untuk mulai.")
 
@@ -149,7 +168,12 @@ if st.session_state.data_saham is not None:
     saham_terpilih = st.selectbox("Pilih saham untuk ditampilkan:", st.session_state.data_saham.columns)
     df_chart = st.session_state.data_saham[[saham_terpilih]].dropna()
     df_chart.index = pd.to_datetime(df_chart.index, format="%d-%m-%Y")
-    st.line_chart(df_chart, height=400)
+    df_chart = df_chart.rename_axis("Tanggal").reset_index()
+    if not df_chart.empty:
+        rentang = charts.date_range_slider(df_chart["Tanggal"], key=f"chart_range_{saham_terpilih}")
+        fig, total_titik, titik_tampil = charts.price_chart(df_chart, "Tanggal", saham_terpilih, date_range=rentang)
+        st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"Menampilkan {titik_tampil} dari {total_titik} titik data")
 else:
     st.subheader("📊 Grafik Harga Saham")
     st.info("Grafik akan muncul setelah data berhasil diambil.")
@@ -163,18 +187,28 @@ if st.session_state.data_saham is not None:
 
     if st.session_state.analysis is None:
         with st.spinner("Menganalisis data saham..."):
-            st.session_state.analysis = analyze_data(st.session_state.data_saham)
+            with instrumentation.run("analyze_data", diag_options["track_memory"], diag_options["profiler"]) as metrics:
+                panel = st.session_state.data_saham
+                stats = shared_value("window_stats", ANALYSIS_PARAMS, lambda: window_statistics(panel))
+                st.session_state.window_stats = stats
+                st.session_state.analysis = shared_value("analysis", ANALYSIS_PARAMS, lambda: status_tables(stats))
+            instrumentation.record_run(metrics, diag_options)
 
-    df_status = st.session_state.analysis[option]
-    st.dataframe(df_status)
+    live = st.toggle("⏱️ Refresh harga intraday", key="intraday_on",
+                     help="Ambil harga terakhir saja secara berkala tanpa mengambil ulang histori 6 tahun.")
+    if live:
+        interval = st.select_slider("Interval refresh (detik)", [30, 60, 120, 300], value=60, key="intraday_interval")
+        st.fragment(run_every=interval)(intraday_status)(option)
+    else:
+        df_status = st.session_state.analysis[option]
+        st.dataframe(df_status)
 
     # Generate file Excel
     st.subheader("4️⃣ Generate File Excel")
-    buffer = BytesIO()
-    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
-        for label, df in st.session_state.analysis.items():
-            df.to_excel(writer, sheet_name=label)
-    buffer.seek(0)
+    with instrumentation.run("export_excel", diag_options["track_memory"], diag_options["profiler"]) as metrics:
+        analysis = st.session_state.analysis
+        buffer = shared_value("status_excel", ANALYSIS_PARAMS, lambda: export_status_excel(analysis).getvalue())
+    instrumentation.record_run(metrics, diag_options)
 
     st.download_button(
         label="💾 Download Excel File",
@@ -183,9 +217,43 @@ if st.session_state.data_saham is not None:
         mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
     )
 
+    # =========================================================
+    # Screener Teknikal
+    # =========================================================
+    st.subheader("5️⃣ Screener Teknikal")
+    with instrumentation.run("screener", diag_options["track_memory"], diag_options["profiler"]) as metrics:
+        panel = st.session_state.data_saham
+        params_key = tuple(sorted(SCREENER_PARAMS.items()))
+        indicators = shared_value("screener", params_key, lambda: compute_indicators(panel, **SCREENER_PARAMS))
+    instrumentation.record_run(metrics, diag_options)
+
+    filters = []
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        if st.checkbox("RSI14 di bawah", key="f_rsi"):
+            filters.append(("RSI14", "<", st.number_input("Batas RSI", 0.0, 100.0, 30.0, key="f_rsi_val")))
+        if st.checkbox("Harga di atas MA200", key="f_ma200"):
+            filters.append(("Now", ">", "MA200"))
+    with col2:
+        if st.checkbox("Drawdown dari puncak minimal (%)", key="f_dd"):
+            filters.append(("Drawdown %", "<=", -st.number_input("Drawdown (%)", 0.0, 100.0, 30.0, key="f_dd_val")))
+        if st.checkbox("Harga di bawah MA50", key="f_ma50"):
+            filters.append(("Now", "<", "MA50"))
+    with col3:
+        if st.checkbox("Posisi 52 minggu maksimal (%)", key="f_52w"):
+            filters.append(("52W Position %", "<=", st.number_input("Posisi 52W (%)", 0.0, 100.0, 20.0, key="f_52w_val")))
+        if st.checkbox("Volatilitas 20 hari maksimal (%)", key="f_vol"):
+            filters.append(("Volatility 20D %", "<=", st.number_input("Volatilitas (%)", 0.0, 500.0, 40.0, key="f_vol_val")))
+
+    hasil_screener = apply_filters(indicators, filters)
+    st.caption(f"{len(hasil_screener)} dari {len(indicators)} saham lolos filter")
+    st.dataframe(hasil_screener, use_container_width=True)
+
 else:
     st.subheader("3️⃣ Analisis Status Saham")
     st.radio("Pilih tipe analisis:", ["Max", "Min", "Mean"], horizontal=True)
     st.info("Analisis belum dapat dilakukan sebelum data diambil.")
     st.subheader("4️⃣ Generate File Excel")
     st.warning("Silakan ambil data saham terlebih dahulu sebelum membuat file Excel.")
+
+instrumentation.render_diagnostics_panel(diag_options)
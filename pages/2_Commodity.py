@@ -1,8 +1,8 @@
 import streamlit as st
-import requests
 import pandas as pd
 from datetime import datetime, timedelta
-import plotly.express as px
+from utils import instrumentation, transport, charts
+from utils.correlation import commodity_sensitivity, rank_sensitivity
 
 # ===============================
 # CONFIG
@@ -22,7 +22,7 @@ def get_symbols():
     Ambil daftar simbol dari CommodityPriceAPI v2
     """
     url = f"{BASE_URL}/symbols"
-    resp = requests.get(url, headers=HEADERS)
+    resp = transport.get(url, headers=HEADERS)
 
     try:
         data = resp.json()
@@ -55,7 +55,7 @@ def fetch_timeseries(symbol: str, start_date: str, end_date: str):
         "end_date": end_date,
         "currency": "USD"
     }
-    resp = requests.get(url, headers=HEADERS, params=params)
+    resp = transport.get(url, headers=HEADERS, params=params)
 
     try:
         data = resp.json()
@@ -75,17 +75,73 @@ def fetch_timeseries(symbol: str, start_date: str, end_date: str):
     df['date'] = pd.to_datetime(df['date'])
     df = df.rename(columns={"price": "Price"})
     df = df.sort_values("date")
+    instrumentation.count("rows_produced", len(df))
     return df
 
+# ===============================
+# Korelasi dengan Saham
+# ===============================
+def show_correlation_section(metals: dict, default_metal: str, start_date: str, end_date: str, diag_options: dict):
+    st.subheader("🔗 Korelasi Komoditas vs Saham")
+    panel = st.session_state.get("data_saham")
+    if panel is None:
+        st.info("Ambil data saham terlebih dahulu di halaman Stock Status untuk menghitung korelasi.")
+        return
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        pilihan = st.multiselect("Komoditas:", list(metals.keys()), default=[default_metal])
+    with col2:
+        window = st.select_slider("Window rolling (hari bursa):", options=[20, 60, 120, 250], value=120)
+
+    if st.button("Hitung Korelasi", disabled=not pilihan):
+        with instrumentation.run("commodity_correlation", diag_options["track_memory"], diag_options["profiler"]) as metrics:
+            commodities = {}
+            with instrumentation.span("fetch_timeseries"):
+                for nama in pilihan:
+                    df = fetch_timeseries(metals[nama], start_date, end_date)
+                    if df is not None and not df.empty:
+                        commodities[nama] = df
+            if commodities:
+                with instrumentation.span("commodity_sensitivity"):
+                    hasil = commodity_sensitivity(panel, commodities, window=window)
+                    ranking = rank_sensitivity(hasil)
+        instrumentation.record_run(metrics, diag_options)
+        if not commodities:
+            st.warning("Data harga komoditas yang dipilih gagal diambil. Coba lagi beberapa saat lagi.")
+            return
+        st.session_state.correlation = {"hasil": hasil, "ranking": ranking, "window": window}
+
+    correlation = st.session_state.get("correlation")
+    if correlation is None:
+        return
+
+    st.markdown(f"**Saham paling sensitif (window {correlation['window']} hari)**")
+    st.dataframe(correlation["ranking"].head(50), use_container_width=True, hide_index=True)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        nama = st.selectbox("Komoditas untuk grafik:", list(correlation["hasil"].keys()))
+    with col2:
+        kode = st.selectbox("Kode saham:", correlation["ranking"]["Kode"].unique())
+    if nama is not None and kode is not None:
+        seri = correlation["hasil"][nama]["corr"][kode].rename("Corr").rename_axis("date").reset_index()
+        fig, _, _ = charts.price_chart(seri, "date", "Corr", title=f"Korelasi rolling {kode} vs {nama}")
+        st.plotly_chart(fig, use_container_width=True)
+
+
 # ===============================
 # Streamlit App
 # ===============================
 def main():
     st.title("📈 Harga Komoditas - 10 Tahun Terakhir")
     st.markdown("Data diambil dari [CommodityPriceAPI v2](https://www.commoditypriceapi.com)")
+    diag_options = instrumentation.diagnostics_options()
 
     # Ambil simbol metals
-    metals = get_symbols()
+    with instrumentation.run("get_symbols", diag_options["track_memory"], diag_options["profiler"]) as metrics:
+        metals = get_symbols()
+    instrumentation.record_run(metrics, diag_options)
     if not metals:
         st.stop()
 
@@ -95,11 +151,13 @@ def main():
     end_date = datetime.today()
     start_date = end_date - timedelta(days=365*10)  # 10 tahun
 
-    df = fetch_timeseries(
-        metals[metal_choice],
-        start_date.strftime("%Y-%m-%d"),
-        end_date.strftime("%Y-%m-%d")
-    )
+    with instrumentation.run("fetch_timeseries", diag_options["track_memory"], diag_options["profiler"]) as metrics:
+        df = fetch_timeseries(
+            metals[metal_choice],
+            start_date.strftime("%Y-%m-%d"),
+            end_date.strftime("%Y-%m-%d")
+        )
+    instrumentation.record_run(metrics, diag_options)
 
     if df is None or df.empty:
         st.warning("Data tidak tersedia untuk pilihan ini.")
@@ -107,8 +165,12 @@ def main():
         st.subheader(f"Harga {metal_choice} (USD)")
 
         # Chart
-        fig = px.line(df, x="date", y="Price", title=f"{metal_choice} Price (10 Tahun)")
+        rentang = charts.date_range_slider(df["date"], key=f"commodity_range_{metal_choice}")
+        fig, total_titik, titik_tampil = charts.price_chart(
+            df, "date", "Price", title=f"{metal_choice} Price (10 Tahun)", date_range=rentang
+        )
         st.plotly_chart(fig, use_container_width=True)
+        st.caption(f"Menampilkan {titik_tampil} dari {total_titik} titik data")
 
         # Dataframe preview
         st.dataframe(df.tail(10))
@@ -121,5 +183,10 @@ def main():
             "Harga rata-rata": round(df["Price"].mean(), 2)
         })
 
+    show_correlation_section(metals, metal_choice, start_date.strftime("%Y-%m-%d"),
+                             end_date.strftime("%Y-%m-%d"), diag_options)
+
+    instrumentation.render_diagnostics_panel(diag_options)
+
 if __name__ == "__main__":
     main()
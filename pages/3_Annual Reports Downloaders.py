@@ -1,9 +1,7 @@
 import streamlit as st
 import pandas as pd
-import openpyxl
 import os
-import requests
-from tkinter import Tk, filedialog
+from utils import instrumentation, transport
 
 st.set_page_config(layout="wide")
 
@@ -13,6 +11,8 @@ st.set_page_config(layout="wide")
 
 # Mencari Directory
 def get_directory():
+    from tkinter import Tk, filedialog
+
     root = Tk()
     root.withdraw()
     root.wm_attributes('-topmost', 1)
@@ -59,16 +59,20 @@ def download_xbrl_idx(kode_perusahaan, tahun, kuartal, directory_download):
         'DNT': '1'
     }
     
+    import requests
+
     try:
         with st.spinner(f'Downloading {kode_perusahaan}...'):
             with requests.Session() as session:
-                session.get("https://www.idx.co.id/", headers=headers)
-                response = session.get(url, headers=headers, stream=True)
+                transport.get("https://www.idx.co.id/", headers=headers, session=session)
+                response = transport.get(url, headers=headers, stream=True, session=session)
                 response.raise_for_status()
                 
                 with open(output_file, 'wb') as f:
                     for chunk in response.iter_content(chunk_size=1024):
                         f.write(chunk)
+                        instrumentation.count("bytes_downloaded", len(chunk))
+                instrumentation.count("files_downloaded")
                 
                 return True, f"✅ {kode_perusahaan} berhasil didownload"
 
@@ -77,6 +81,7 @@ def download_xbrl_idx(kode_perusahaan, tahun, kuartal, directory_download):
 
 
 daftar_saham = pd.read_excel("database/Daftar Saham.xlsx")
+diag_options = instrumentation.diagnostics_options()
 
 ##################################
 ##             VIEW             ##
@@ -150,16 +155,19 @@ with st.container(border=True):
                         status_text = progress_container.empty()
                         
                         results = []
-                        for i, kode in enumerate(selected_companies):
-                            status_text.text(f"Memproses {kode} ({i+1}/{total_companies})")
-                            success, message = download_xbrl_idx(kode, tahun, kuartal, st.session_state.selected_dir)
-                            results.append((kode, success, message))
-                            
-                            if success:
-                                success_count += 1
-                            
-                            # Update progress bar
-                            progress_bar.progress((i + 1) / total_companies)
+                        with instrumentation.run("download_xbrl_idx", diag_options["track_memory"], diag_options["profiler"]) as metrics:
+                            for i, kode in enumerate(selected_companies):
+                                status_text.text(f"Memproses {kode} ({i+1}/{total_companies})")
+                                with instrumentation.span(kode):
+                                    success, message = download_xbrl_idx(kode, tahun, kuartal, st.session_state.selected_dir)
+                                results.append((kode, success, message))
+                                
+                                if success:
+                                    success_count += 1
+                                
+                                # Update progress bar
+                                progress_bar.progress((i + 1) / total_companies)
+                        instrumentation.record_run(metrics, diag_options)
                         
                         # Clear progress elements
                         progress_bar.empty()
@@ -225,4 +233,6 @@ with st.container(border=True):
             # Tampilkan jumlah yang dipilih
             selected_count = edited_df['Pilih'].sum()
             total_count = len(edited_df)
-            st.caption(f"📊 {selected_count} dari {total_count} perusahaan dipilih")
\ No newline at end of file
+            st.caption(f"📊 {selected_count} dari {total_count} perusahaan dipilih")
+
+instrumentation.render_diagnostics_panel(diag_options)
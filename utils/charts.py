@@ -0,0 +1,98 @@
+import numpy as np
+import pandas as pd
+
+# =========================================================
+# Downsampling data grafik di sisi server
+# =========================================================
+# Lebar grafik di layar jarang lebih dari ~1000 px, jadi mengirim lebih
+# banyak titik dari itu hanya memperbesar payload ke browser.
+MAX_POINTS = 1000
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Largest-Triangle-Three-Buckets: pilih n_out titik yang mempertahankan bentuk garis.
+    """
+    n = len(x)
+    if n_out >= n or n_out < 3:
+        return np.arange(n)
+
+    # Titik pertama dan terakhir selalu dipertahankan, sisanya dibagi ke n_out - 2 bucket
+    edges = np.linspace(1, n - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    prev = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        # Rata-rata bucket berikutnya menjadi titik ketiga segitiga
+        next_start, next_end = end, edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = x[next_start:next_end].mean()
+        avg_y = y[next_start:next_end].mean()
+
+        bx, by = x[start:end], y[start:end]
+        area = np.abs((x[prev] - avg_x) * (by - y[prev]) - (x[prev] - bx) * (avg_y - y[prev]))
+        prev = start + int(area.argmax())
+        selected[i + 1] = prev
+    return selected
+
+
+def minmax_indices(y: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Ambil titik minimum dan maksimum di setiap bucket, jadi lonjakan harga tidak hilang.
+    """
+    n = len(y)
+    if n_out >= n or n_out < 2:
+        return np.arange(n)
+
+    buckets = np.arange(n) * (n_out // 2) // n
+    grouped = pd.Series(y).groupby(buckets)
+    idx = np.concatenate([grouped.idxmin().to_numpy(), grouped.idxmax().to_numpy(), [0, n - 1]])
+    return np.unique(idx)
+
+
+def downsample(df: pd.DataFrame, x: str, y: str, n_out: int = MAX_POINTS, method: str = "lttb") -> pd.DataFrame:
+    df = df.dropna(subset=[y])
+    if len(df) <= n_out:
+        return df
+
+    y_values = df[y].to_numpy(dtype=float)
+    if method == "minmax":
+        idx = minmax_indices(y_values, n_out)
+    else:
+        x_values = pd.to_datetime(df[x]).to_numpy().astype("int64").astype(float)
+        idx = lttb_indices(x_values, y_values, n_out)
+    return df.iloc[idx]
+
+
+def price_chart(df: pd.DataFrame, x: str, y: str, title: str = None, date_range=None,
+                n_out: int = MAX_POINTS, method: str = "lttb", height: int = 400):
+    """
+    Bangun figure plotly dari seri harga panjang: potong ke rentang tanggal,
+    lalu downsample ke resolusi layar.
+    """
+    import plotly.graph_objects as go
+
+    if date_range is not None:
+        start, end = pd.Timestamp(date_range[0]), pd.Timestamp(date_range[1])
+        df = df[(df[x] >= start) & (df[x] <= end)]
+
+    visible = len(df)
+    df = downsample(df, x, y, n_out=n_out, method=method)
+    fig = go.Figure(go.Scatter(x=df[x], y=df[y], mode="lines", name=y))
+    fig.update_layout(title=title, height=height, margin=dict(l=10, r=10, t=40 if title else 10, b=10))
+    return fig, visible, len(df)
+
+
+def date_range_slider(dates: pd.Series, key: str, label: str = "Rentang tanggal:"):
+    """
+    Slider rentang tanggal. Saat rentang dipersempit, data di-downsample ulang
+    sehingga detail di rentang tersebut muncul kembali.
+    """
+    import streamlit as st
+
+    min_date, max_date = dates.min().date(), dates.max().date()
+    if min_date == max_date:
+        return min_date, max_date
+    return st.slider(label, min_value=min_date, max_value=max_date, value=(min_date, max_date),
+                     format="DD-MM-YYYY", key=key)
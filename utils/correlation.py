@@ -0,0 +1,107 @@
+import numpy as np
+import pandas as pd
+
+from utils.screener import price_matrix
+
+# =========================================================
+# Korelasi & beta rolling: komoditas vs panel saham
+# =========================================================
+# Semua pasangan (saham x komoditas) dihitung sekaligus dengan window
+# dari selisih cumulative sum, bukan satu rolling() per pasangan.
+# Kolom saham diproses per blok agar memori puncak tetap terbatas.
+CHUNK_TICKERS = 256
+
+
+def align_commodity(commodity: pd.DataFrame, dates: pd.DatetimeIndex,
+                    date_col: str = "date", price_col: str = "Price") -> pd.Series:
+    """
+    Samakan seri komoditas ke tanggal perdagangan saham (nilai terakhir yang diketahui).
+    """
+    series = commodity.set_index(date_col)[price_col].astype("float64")
+    series.index = pd.to_datetime(series.index).tz_localize(None).normalize()
+    series = series[~series.index.duplicated(keep="last")].sort_index()
+    return series.reindex(series.index.union(dates)).ffill().reindex(dates)
+
+
+def _window_sum(values: np.ndarray, window: int) -> np.ndarray:
+    cs = np.cumsum(values, axis=0)
+    out = np.empty_like(cs)
+    out[:window] = cs[:window]
+    out[window:] = cs[window:] - cs[:-window]
+    return out
+
+
+def rolling_corr_beta(x: np.ndarray, Y: np.ndarray, window: int, min_periods: int = None):
+    """
+    x: return komoditas (T,), Y: return saham (T, N). NaN diabaikan per pasangan.
+    Kembalikan (corr, beta) berukuran (T, N) float32; beta = cov(x, y) / var(x).
+    """
+    min_periods = min_periods or window
+    T, N = Y.shape
+    corr = np.full((T, N), np.nan, dtype=np.float32)
+    beta = np.full((T, N), np.nan, dtype=np.float32)
+
+    for start in range(0, N, CHUNK_TICKERS):
+        y = Y[:, start:start + CHUNK_TICKERS]
+        valid = ~np.isnan(y) & ~np.isnan(x)[:, None]
+        xv = np.where(valid, x[:, None], 0.0)
+        yv = np.where(valid, y, 0.0)
+
+        n = _window_sum(valid.astype(np.float64), window)
+        sx, sy = _window_sum(xv, window), _window_sum(yv, window)
+        sxx, syy = _window_sum(xv * xv, window), _window_sum(yv * yv, window)
+        sxy = _window_sum(xv * yv, window)
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            cov = sxy - sx * sy / n
+            var_x = sxx - sx * sx / n
+            var_y = syy - sy * sy / n
+            c = cov / np.sqrt(var_x * var_y)
+            b = cov / var_x
+        enough = n >= min_periods
+        block = slice(start, start + y.shape[1])
+        corr[:, block] = np.where(enough, np.clip(c, -1, 1), np.nan)
+        beta[:, block] = np.where(enough, b, np.nan)
+    return corr, beta
+
+
+def commodity_sensitivity(panel: pd.DataFrame, commodities: dict, window: int = 120) -> dict:
+    """
+    commodities: {nama: DataFrame(date, Price)}. Hasil per komoditas berupa
+    dict berisi DataFrame 'corr' dan 'beta' (tanggal x kode saham).
+    """
+    prices = price_matrix(panel)
+    # Forward-fill tidak mengisi NaN sebelum listing, jadi return di periode itu tetap NaN
+    returns = prices.pct_change().to_numpy()
+
+    results = {}
+    for name, commodity in commodities.items():
+        x = align_commodity(commodity, prices.index).pct_change().to_numpy()
+        corr, beta = rolling_corr_beta(x, returns, window, min_periods=int(window * 0.8))
+        results[name] = {
+            "corr": pd.DataFrame(corr, index=prices.index, columns=prices.columns),
+            "beta": pd.DataFrame(beta, index=prices.index, columns=prices.columns),
+        }
+    return results
+
+
+def rank_sensitivity(results: dict, lookback: int = 252) -> pd.DataFrame:
+    """
+    Peringkat saham paling sensitif terhadap komoditas, berdasarkan |korelasi| terakhir.
+    """
+    columns = ["Kode", "Komoditas", "Corr", "Beta", f"Mean Corr {lookback}D"]
+    if not results:
+        return pd.DataFrame(columns=columns)
+    rows = []
+    for name, res in results.items():
+        corr, beta = res["corr"], res["beta"]
+        rows.append(pd.DataFrame({
+            "Kode": corr.columns,
+            "Komoditas": name,
+            "Corr": corr.iloc[-1].to_numpy(),
+            "Beta": beta.iloc[-1].to_numpy(),
+            f"Mean Corr {lookback}D": corr.iloc[-lookback:].mean().to_numpy(),
+        }))
+    ranking = pd.concat(rows, ignore_index=True).dropna(subset=["Corr"])
+    ranking = ranking.reindex(ranking["Corr"].abs().sort_values(ascending=False).index)
+    return ranking.reset_index(drop=True).round(3)
@@ -0,0 +1,233 @@
+import streamlit as st
+import numpy as np
+import pandas as pd
+import os
+import warnings
+from dataclasses import dataclass
+from utils import instrumentation, transport, xlsx_reader
+
+warnings.filterwarnings('ignore', category=UserWarning, module='openpyxl')
+
+def file_info_scraper(folder_path, status=None):
+    from tqdm import tqdm
+
+    xlsx_files = [f for f in os.listdir(folder_path) if f.endswith(".xlsx")]
+    data = {"NamaFile":[], "kode entitas": [], "NamaSheetPK": [], "NamaSheetLR": [], "NamaSheetAK": []}
+    
+    progress_bar = st.progress(0, text="Mengumpulkan informasi file...") if status else None
+    
+    for i, namefile in enumerate(tqdm(xlsx_files, desc="Scanning files")):
+        file_path = os.path.join(folder_path, namefile)
+        try:
+            xls = pd.ExcelFile(file_path)
+        except Exception as e:
+            if status:
+                status.write(f"⚠️ File {namefile} error: {str(e)}")
+            continue
+        instrumentation.count("files_parsed")
+            
+        data["kode entitas"].append(namefile[-9:-5])
+        sheet_pk, sheet_lr, sheet_ak = None, None, None
+        
+        for sheet in xls.sheet_names:
+            df = pd.read_excel(xls, sheet_name=sheet, nrows=10, dtype=str)
+            instrumentation.count("sheets_scanned")
+            text = " ".join(df.astype(str).fillna("").values.flatten())
+            
+            if "Statement of financial position" in text:
+                sheet_pk = sheet
+            if "Statement of profit or loss and other comprehensive income" in text:
+                sheet_lr = sheet
+            if "Statement of cash flows" in text:
+                sheet_ak = sheet
+                
+        data["NamaSheetPK"].append(sheet_pk)
+        data["NamaSheetLR"].append(sheet_lr)
+        data["NamaSheetAK"].append(sheet_ak)
+        data["NamaFile"].append(namefile)
+        
+        if progress_bar:
+            progress = (i + 1) / len(xlsx_files)
+            progress_bar.progress(progress, text=f"Memproses file {i+1}/{len(xlsx_files)}")
+    
+    return pd.DataFrame(data)
+
+# Rencana ekstraksi per template sheet IDX. Layout template dideteksi sekali
+# dari file pertama, file berikutnya dengan label kolom A yang sama langsung
+# diambil nilainya (kolom B:C lewat xlsx_reader) tanpa read_excel, transpose
+# dan cleanup DataFrame penuh. Jika layout tidak dikenali, file diproses
+# dengan cara lama (_extract_generic).
+@dataclass(frozen=True)
+class ExtractionPlan:
+    sheet_name: str
+    signature: tuple    # label kolom A semua baris data, untuk verifikasi
+    positions: np.ndarray  # baris yang diambil (index dari baris data)
+    columns: list       # nama kolom output (label lowercase, baris tanggal = "tanggal")
+
+_plans = {}
+
+def _read_statement_rows(file_path, sheet_name):
+    """
+    Baris data (tanpa header) sebagai tuple (A, B, C), atau None jika lebar
+    sheet bukan 4 kolom (A: label, B: periode kini, C: periode lalu, D: label Inggris).
+    """
+    rows, width = xlsx_reader.read_sheet_rows(file_path, sheet_name, max_col=3)
+    if width != 4:
+        return None
+    # Baris 1 adalah header (sama seperti read_excel), data mulai baris 2
+    rows = rows[1:]
+    while rows and all(v is None for v in rows[-1]):
+        rows.pop()
+    return rows
+
+def _has_orphan_values(rows):
+    # Baris tanpa label tapi ada nilai tidak bisa diwakili plan (jalur lama memberi kolom NaN)
+    return any(label is None and any(v is not None for v in values) for label, *values in rows[1:])
+
+def compile_plan(sheet_name, rows):
+    """
+    Kembalikan ExtractionPlan, atau None jika layout tidak sesuai pola IDX
+    (baris judul di baris data 0 dan tanggal di baris data 2).
+    """
+    if len(rows) < 3 or rows[0][0] is None or rows[2][0] is None or _has_orphan_values(rows):
+        return None
+    positions, columns = [], []
+    for i, (label, *values) in enumerate(rows[1:], start=1):
+        if label is None:
+            continue
+        positions.append(i)
+        # Label non-teks menjadi NaN, sama seperti .str.lower() di jalur lama
+        columns.append("tanggal" if i == 2 else label.lower() if isinstance(label, str) else np.nan)
+    signature = tuple(row[0] for row in rows)
+    return ExtractionPlan(sheet_name, signature, np.array(positions), columns)
+
+def _extract_with_plan(plan, rows):
+    values = np.array([row[1:] for row in rows], dtype=object)[plan.positions].T
+    return pd.DataFrame(values, columns=plan.columns).dropna(axis=1, how="all")
+
+def _extract_generic(file_path, sheet_name):
+    file_target = pd.read_excel(file_path, sheet_name=sheet_name, index_col=None)
+    file_target = file_target.dropna(how="all").T
+    file_target = file_target.drop(file_target.columns[0], axis=1).reset_index(drop=True).drop(3)
+    file_target.loc[0, 2] = "Tanggal"
+    file_target.columns = file_target.iloc[0].str.lower()
+    return file_target[1:].dropna(axis=1, how="all")
+
+def extract_statement(file_path, sheet_name):
+    try:
+        rows = _read_statement_rows(file_path, sheet_name)
+    except (KeyError, ValueError):
+        rows = None
+    # Dicek per file: label kolom A boleh sama dengan template, tapi nilainya belum tentu
+    if rows is not None and not _has_orphan_values(rows):
+        signature = tuple(row[0] for row in rows)
+        plan = _plans.get((sheet_name, signature))
+        if plan is None:
+            plan = compile_plan(sheet_name, rows)
+            if plan is not None:
+                _plans[(sheet_name, signature)] = plan
+                instrumentation.count("plans_compiled")
+        if plan is not None:
+            instrumentation.count("plan_hits")
+            return _extract_with_plan(plan, rows)
+    instrumentation.count("plan_fallbacks")
+    return _extract_generic(file_path, sheet_name)
+
+def xbrl_scraper(jenis_laporan, kolom_sheet, folderpath, output_dir, *, data=None):
+    from tqdm import tqdm
+
+    # Hasil file_info_scraper dari pemanggil dipakai ulang agar folder tidak di-scan lagi
+    if data is None:
+        with instrumentation.span(f"file_info_scraper[{kolom_sheet}]"):
+            data = file_info_scraper(folderpath)
+    data_transit_path = os.path.join(output_dir, "temp/")
+    os.makedirs(data_transit_path, exist_ok=True)
+    
+    for sheet_name in tqdm(jenis_laporan, desc=f"Processing {kolom_sheet}"):
+        if pd.isna(sheet_name):
+            continue
+            
+        data_filtered = data[data[kolom_sheet] == sheet_name].reset_index(drop=True)
+        hasil = []
+        
+        for _, row in data_filtered.iterrows():
+            try:
+                file_path = os.path.join(folderpath, row['NamaFile'])
+                file_target = extract_statement(file_path, sheet_name)
+                instrumentation.count("sheets_extracted")
+                file_target["kode entitas"] = [row["kode entitas"]] * 2
+                hasil.append(file_target)
+            except Exception as e:
+                st.warning(f"Error pada {row['kode entitas']}: {str(e)}")
+        
+        if hasil:
+            wadah_transit = pd.concat(hasil, ignore_index=True)
+            instrumentation.count("rows_produced", len(wadah_transit))
+            wadah_transit.to_excel(f"{data_transit_path}{sheet_name}.xlsx", index=False)
+
+def gabungkan_data(jenis_laporan, data_transit_path):
+    data_transit_path = os.path.join(data_transit_path, "temp/")
+    gabung_all = pd.concat([
+        pd.read_excel(f"{data_transit_path}{sheet}.xlsx") for sheet in jenis_laporan if pd.notna(sheet)
+    ], ignore_index=True)
+    
+    kolom_awal = ["kode entitas"]
+    gabung_all = gabung_all[kolom_awal + [col for col in gabung_all.columns if col not in kolom_awal]].fillna(0)
+    instrumentation.count("rows_produced", len(gabung_all))
+    return gabung_all
+
+def pemisah_data(df):
+    current_q = df.iloc[::2].reset_index(drop=True)
+    previous_q = df.iloc[1::2].reset_index(drop=True)
+    return current_q, previous_q
+
+def general_information(folderpath, data):
+    info_entitas = pd.concat([
+        pd.read_excel(os.path.join(folderpath, file), sheet_name="1000000").T.dropna(how="all").reset_index(drop=True).drop(2)
+        for file in data["NamaFile"]
+    ], ignore_index=True)
+    
+    info_entitas = info_entitas.drop_duplicates().reset_index(drop=True)
+    info_entitas.columns = info_entitas.iloc[0].str.lower()
+    info_entitas = info_entitas.drop(info_entitas.columns[:2], axis=1).drop(0)
+    
+    return info_entitas
+
+def stock_latest_googlefinance(kode_entitas_list):
+    from tqdm import tqdm
+    from bs4 import BeautifulSoup
+
+    harga_stock = {"kode entitas": [], "penutupan": []}
+    
+    for ticker in tqdm(kode_entitas_list, desc="Getting stock prices"):
+        try:
+            url = f'https://www.google.com/finance/quote/{ticker}:IDX?hl=en'
+            response = transport.get(url, timeout=10)
+            soup = BeautifulSoup(response.content, 'html.parser')
+            stock_price = soup.find('div', class_='AHmHk').text
+            stock_price = "".join(filter(str.isdigit, stock_price))
+            stock_price = int(stock_price) // 100
+            
+            harga_stock["kode entitas"].append(ticker)
+            harga_stock["penutupan"].append(stock_price)
+        except Exception as e:
+            st.warning(f"Gagal mendapatkan harga saham {ticker}: {str(e)}")
+            harga_stock["kode entitas"].append(ticker)
+            harga_stock["penutupan"].append(None)
+    
+    return pd.DataFrame(harga_stock)
+
+def export_report(output_file, general_info, laporan_pk_all, laporan_lr_all, laporan_ak_all, latest_stock):
+    PK_currentQ, PK_previousQ = pemisah_data(laporan_pk_all)
+    LR_currentQ, LR_previousQ = pemisah_data(laporan_lr_all)
+    AK_currentQ, AK_previousQ = pemisah_data(laporan_ak_all)
+
+    with pd.ExcelWriter(output_file, engine='openpyxl') as writer:
+        general_info.to_excel(writer, sheet_name="gen_info", index=False)
+        PK_currentQ.to_excel(writer, sheet_name="pk_now", index=False)
+        LR_currentQ.to_excel(writer, sheet_name="lr_now", index=False)
+        AK_currentQ.to_excel(writer, sheet_name="ak_now", index=False)
+        PK_previousQ.to_excel(writer, sheet_name="pk_prev", index=False)
+        LR_previousQ.to_excel(writer, sheet_name="lr_prev", index=False)
+        AK_previousQ.to_excel(writer, sheet_name="ak_prev", index=False)
+        latest_stock.to_excel(writer, sheet_name="stock_info", index=False)
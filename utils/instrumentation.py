@@ -0,0 +1,260 @@
+import cProfile
+import io
+import json
+import os
+import pstats
+import threading
+import time
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+
+# =========================================================
+# Instrumentasi ringan: span bernama, counter, peak memory
+# =========================================================
+# Setiap sesi Streamlit berjalan di thread sendiri, jadi run aktif
+# disimpan di ContextVar agar tidak tercampur antar pengguna.
+_current_run = ContextVar("fiber_current_run", default=None)
+
+# tracemalloc berlaku untuk seluruh proses, sedangkan sesi berjalan bersamaan.
+# Start/stop dihitung per pemakai, dan peak hanya di-reset jika tidak ada run
+# lain yang sedang mengukur; angka peak tetap mencakup semua thread di proses.
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_tracing_owned = False
+
+PROFILERS = ["Off", "cProfile", "pyinstrument"]
+
+
+def diagnostics_enabled_by_env() -> bool:
+    return os.environ.get("FIBER_DIAGNOSTICS", "").lower() in ("1", "true", "yes")
+
+
+class RunMetrics:
+    """
+    Kumpulan span, counter dan hasil profiling untuk satu eksekusi.
+    """
+
+    def __init__(self, name: str, track_memory: bool = False):
+        self.name = name
+        self.track_memory = track_memory
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+        self.duration = None
+        self.spans = []
+        self.counters = {}
+        self.profile_text = None
+        self._stack = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def span(self, name: str):
+        path = "/".join([s["name"] for s in self._stack] + [name])
+        frame = {"name": name, "peak": 0}
+        if self.track_memory and tracemalloc.is_tracing():
+            # Simpan peak milik parent sebelum di-reset untuk stage ini
+            if self._stack:
+                parent = self._stack[-1]
+                parent["peak"] = max(parent["peak"], tracemalloc.get_traced_memory()[1])
+            with _tracing_lock:
+                if _tracing_users <= 1:
+                    tracemalloc.reset_peak()
+            frame["base"] = tracemalloc.get_traced_memory()[0]
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            peak_bytes = None
+            if "base" in frame and tracemalloc.is_tracing():
+                frame["peak"] = max(frame["peak"], tracemalloc.get_traced_memory()[1])
+                peak_bytes = frame["peak"] - frame["base"]
+                if self._stack:
+                    parent = self._stack[-1]
+                    parent["peak"] = max(parent["peak"], frame["peak"])
+            with self._lock:
+                self.spans.append({
+                    "name": path,
+                    "depth": len(self._stack),
+                    "seconds": round(elapsed, 6),
+                    "process_peak_memory_mb": None if peak_bytes is None else round(peak_bytes / 1024 ** 2, 3),
+                })
+
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def to_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "started_at": self.started_at,
+            "seconds": None if self.duration is None else round(self.duration, 6),
+            "spans": list(self.spans),
+            "counters": dict(self.counters),
+            "profile": self.profile_text,
+        }
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict(), indent=2, default=str)
+
+
+def _start_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _tracing_owned = True
+        _tracing_users += 1
+
+
+def _stop_tracing():
+    global _tracing_users, _tracing_owned
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _tracing_owned:
+            tracemalloc.stop()
+            _tracing_owned = False
+
+
+@contextmanager
+def run(name: str, track_memory: bool = False, profiler: str = None):
+    """
+    Mulai run baru. Span dan counter di dalam blok ini dicatat ke run tersebut.
+    """
+    metrics = RunMetrics(name, track_memory=track_memory)
+    token = _current_run.set(metrics)
+
+    if track_memory:
+        _start_tracing()
+
+    prof = None
+    if profiler == "cProfile":
+        prof = cProfile.Profile()
+        prof.enable()
+    elif profiler == "pyinstrument":
+        try:
+            from pyinstrument import Profiler
+            prof = Profiler()
+            prof.start()
+        except ImportError:
+            metrics.profile_text = "pyinstrument tidak terpasang (pip install pyinstrument)"
+
+    start = time.perf_counter()
+    try:
+        with metrics.span(name):
+            yield metrics
+    finally:
+        metrics.duration = time.perf_counter() - start
+        if isinstance(prof, cProfile.Profile):
+            prof.disable()
+            out = io.StringIO()
+            pstats.Stats(prof, stream=out).sort_stats("cumulative").print_stats(40)
+            metrics.profile_text = out.getvalue()
+        elif prof is not None:
+            prof.stop()
+            metrics.profile_text = prof.output_text(unicode=True, color=False)
+        if track_memory:
+            _stop_tracing()
+        _current_run.reset(token)
+
+
+def current_run():
+    return _current_run.get()
+
+
+@contextmanager
+def span(name: str):
+    metrics = _current_run.get()
+    if metrics is None:
+        yield
+        return
+    with metrics.span(name):
+        yield
+
+
+def count(name: str, value: int = 1):
+    metrics = _current_run.get()
+    if metrics is not None:
+        metrics.count(name, value)
+
+
+# =========================================================
+# Panel diagnostics Streamlit
+# =========================================================
+MAX_STORED_RUNS = 20
+
+
+def diagnostics_options() -> dict:
+    """
+    Tampilkan pengaturan diagnostics di sidebar, kembalikan argumen untuk run().
+    """
+    import streamlit as st
+
+    with st.sidebar.expander("🩺 Diagnostics", expanded=False):
+        enabled = st.toggle("Tampilkan panel diagnostics", value=diagnostics_enabled_by_env(),
+                            key="diag_enabled")
+        track_memory = st.checkbox("Ukur peak memory per stage (seluruh proses)", value=False, key="diag_memory",
+                                   disabled=not enabled)
+        profiler = st.selectbox("Profiler", PROFILERS, key="diag_profiler", disabled=not enabled)
+
+    return {
+        "enabled": enabled,
+        "track_memory": enabled and track_memory,
+        "profiler": profiler if enabled and profiler != "Off" else None,
+    }
+
+
+def record_run(metrics: RunMetrics, options: dict):
+    """
+    Simpan run ke session state, hanya jika panel diagnostics aktif.
+    """
+    import streamlit as st
+
+    if not options.get("enabled"):
+        return
+
+    runs = st.session_state.setdefault("diagnostics_runs", [])
+    runs.append(metrics.to_dict())
+    del runs[:-MAX_STORED_RUNS]
+
+
+def render_diagnostics_panel(options: dict):
+    import streamlit as st
+    import pandas as pd
+
+    if not options.get("enabled"):
+        return
+
+    runs = st.session_state.get("diagnostics_runs", [])
+    with st.expander("🩺 Diagnostics", expanded=False):
+        if not runs:
+            st.info("Belum ada run yang tercatat.")
+            return
+
+        labels = [f"{r['started_at']} - {r['name']} ({r['seconds']}s)" for r in runs]
+        idx = st.selectbox("Pilih run:", range(len(runs)), index=len(runs) - 1,
+                           format_func=lambda i: labels[i], key="diag_run_choice")
+        selected = runs[idx]
+
+        st.markdown("**Stage**")
+        st.dataframe(pd.DataFrame(selected["spans"]), use_container_width=True, hide_index=True)
+        if any(s.get("process_peak_memory_mb") is not None for s in selected["spans"]):
+            st.caption("Peak memory diukur untuk seluruh proses (tracemalloc), termasuk sesi lain "
+                       "yang berjalan bersamaan, jadi merupakan batas atas per stage.")
+        if selected["counters"]:
+            st.markdown("**Counter**")
+            st.dataframe(pd.Series(selected["counters"], name="value").to_frame(),
+                         use_container_width=True)
+        if selected["profile"]:
+            st.markdown("**Profile**")
+            st.code(selected["profile"], language="text")
+
+        st.download_button(
+            label="💾 Export JSON",
+            data=json.dumps(runs, indent=2, default=str),
+            file_name="diagnostics.json",
+            mime="application/json",
+            key="diag_export",
+        )
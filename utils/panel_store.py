@@ -0,0 +1,111 @@
+import json
+import os
+import shutil
+import threading
+import time
+import uuid
+
+import numpy as np
+import pandas as pd
+
+# =========================================================
+# Panel harga memory-mapped, dibagi antar proses
+# =========================================================
+# Struktur direktori:
+#   <store>/CURRENT              -> nama versi yang aktif
+#   <store>/v<waktu>-<id>/prices.npy   float64 (tanggal x kode), dibaca lewat mmap
+#   <store>/v<waktu>-<id>/index.json   daftar tanggal, kode saham dan metadata
+# Versi baru ditulis ke direktori sementara lalu di-rename, kemudian CURRENT
+# diganti dengan os.replace, jadi pembaca tidak pernah melihat versi setengah jadi.
+DEFAULT_STORE = os.environ.get("FIBER_PANEL_STORE", "database/panel_store")
+KEEP_VERSIONS = 3
+
+_mapped = {}
+_lock = threading.Lock()
+
+
+class SharedPanel:
+    def __init__(self, version: str, values: np.ndarray, dates: list, tickers: list, meta: dict):
+        self.version = version
+        self.values = values
+        self.dates = dates
+        self.tickers = tickers
+        self.meta = meta
+
+    @property
+    def created_at(self) -> float:
+        return self.meta.get("created_at", 0.0)
+
+    def frame(self) -> pd.DataFrame:
+        """
+        DataFrame read-only tanpa salinan di atas mapping yang sama.
+        """
+        return pd.DataFrame(self.values, index=pd.Index(self.dates), columns=pd.Index(self.tickers), copy=False)
+
+
+def publish(panel: pd.DataFrame, meta: dict = None, store_dir: str = DEFAULT_STORE) -> SharedPanel:
+    os.makedirs(store_dir, exist_ok=True)
+    version = f"v{time.time_ns()}-{uuid.uuid4().hex[:8]}"
+    tmp_dir = os.path.join(store_dir, f".tmp-{version}")
+    os.makedirs(tmp_dir)
+
+    values = np.ascontiguousarray(panel.to_numpy(dtype=np.float64))
+    np.save(os.path.join(tmp_dir, "prices.npy"), values)
+    index = {
+        "dates": [str(d) for d in panel.index],
+        "tickers": [str(t) for t in panel.columns],
+        "meta": {**(meta or {}), "created_at": time.time()},
+    }
+    with open(os.path.join(tmp_dir, "index.json"), "w") as f:
+        json.dump(index, f)
+
+    os.rename(tmp_dir, os.path.join(store_dir, version))
+    pointer_tmp = os.path.join(store_dir, f"CURRENT.{version}")
+    with open(pointer_tmp, "w") as f:
+        f.write(version)
+    os.replace(pointer_tmp, os.path.join(store_dir, "CURRENT"))
+
+    _prune(store_dir, keep=version)
+    return load_version(version, store_dir)
+
+
+def current_version(store_dir: str = DEFAULT_STORE):
+    try:
+        with open(os.path.join(store_dir, "CURRENT")) as f:
+            return f.read().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def load_version(version: str, store_dir: str = DEFAULT_STORE) -> SharedPanel:
+    key = (os.path.abspath(store_dir), version)
+    with _lock:
+        shared = _mapped.get(key)
+        if shared is None:
+            version_dir = os.path.join(store_dir, version)
+            with open(os.path.join(version_dir, "index.json")) as f:
+                index = json.load(f)
+            values = np.load(os.path.join(version_dir, "prices.npy"), mmap_mode="r")
+            shared = SharedPanel(version, values, index["dates"], index["tickers"], index["meta"])
+            # Hanya versi terbaru per store yang dipegang, mapping lama dilepas
+            for old in [k for k in _mapped if k[0] == key[0]]:
+                del _mapped[old]
+            _mapped[key] = shared
+    return shared
+
+
+def load_current(store_dir: str = DEFAULT_STORE):
+    version = current_version(store_dir)
+    if version is None:
+        return None
+    try:
+        return load_version(version, store_dir)
+    except FileNotFoundError:
+        return None
+
+
+def _prune(store_dir: str, keep: str):
+    versions = sorted(d for d in os.listdir(store_dir) if d.startswith("v") and d != keep)
+    for old in versions[:max(0, len(versions) - (KEEP_VERSIONS - 1))]:
+        # Di Windows file yang masih di-mmap proses lain tidak bisa dihapus; coba lagi di publish berikutnya
+        shutil.rmtree(os.path.join(store_dir, old), ignore_errors=True)
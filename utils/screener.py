@@ -0,0 +1,98 @@
+import operator
+
+import numpy as np
+import pandas as pd
+
+# =========================================================
+# Screener teknikal tervektorisasi di atas panel harga lebar
+# =========================================================
+# Semua indikator dihitung sekaligus untuk seluruh kode saham sebagai
+# operasi array (tanggal x kode); tidak ada loop Python per saham.
+TRADING_DAYS = 252
+
+OPERATORS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def price_matrix(panel: pd.DataFrame) -> pd.DataFrame:
+    """
+    Ubah panel dari fetch_stock_data (index string dd-mm-yyyy) menjadi
+    matriks float yang terurut per tanggal dan sudah di-forward-fill.
+    """
+    prices = panel.copy()
+    if not isinstance(prices.index, pd.DatetimeIndex):
+        prices.index = pd.to_datetime(prices.index, format="%d-%m-%Y")
+    prices = prices.sort_index().astype("float64").ffill()
+    return prices.dropna(axis=1, how="all")
+
+
+def _tail_stat(values: np.ndarray, window: int, func) -> np.ndarray:
+    tail = values[-window:]
+    valid = np.count_nonzero(~np.isnan(tail), axis=0)
+    with np.errstate(all="ignore"):
+        result = func(tail, axis=0)
+    # Saham dengan histori kurang dari window tidak diberi nilai
+    return np.where(valid >= window, result, np.nan)
+
+
+def rsi(prices: pd.DataFrame, period: int = 14) -> np.ndarray:
+    """
+    RSI Wilder untuk baris terakhir, dihitung dengan EWM (alpha = 1/period) di seluruh kolom.
+    """
+    delta = prices.diff()
+    gain = delta.clip(lower=0).ewm(alpha=1 / period, adjust=False, min_periods=period).mean().iloc[-1]
+    loss = (-delta.clip(upper=0)).ewm(alpha=1 / period, adjust=False, min_periods=period).mean().iloc[-1]
+    gain, loss = gain.to_numpy(), loss.to_numpy()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        result = 100 - 100 / (1 + gain / loss)
+    # Tanpa penurunan sama sekali berarti RSI 100
+    return np.where((loss == 0) & (gain > 0), 100.0, result)
+
+
+def compute_indicators(panel: pd.DataFrame, ma_windows=(20, 50, 200), rsi_period: int = 14,
+                       vol_window: int = 20) -> pd.DataFrame:
+    prices = price_matrix(panel)
+    values = prices.to_numpy()
+    now = values[-1]
+
+    indicators = {"Now": now}
+    for window in ma_windows:
+        indicators[f"MA{window}"] = _tail_stat(values, window, np.nanmean)
+
+    indicators[f"RSI{rsi_period}"] = rsi(prices, rsi_period)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        indicators["Drawdown %"] = (now / np.nanmax(values, axis=0) - 1) * 100
+
+        high_52w = np.nanmax(values[-TRADING_DAYS:], axis=0)
+        low_52w = np.nanmin(values[-TRADING_DAYS:], axis=0)
+        indicators["52W High"] = high_52w
+        indicators["52W Low"] = low_52w
+        indicators["52W Position %"] = (now - low_52w) / (high_52w - low_52w) * 100
+
+        log_returns = np.diff(np.log(values[-(vol_window + 1):]), axis=0)
+        indicators[f"Volatility {vol_window}D %"] = (
+            _tail_stat(log_returns, vol_window, lambda a, axis: np.nanstd(a, axis=axis, ddof=1))
+            * np.sqrt(TRADING_DAYS) * 100
+        )
+
+    result = pd.DataFrame(indicators, index=prices.columns)
+    return result.round(2)
+
+
+def apply_filters(indicators: pd.DataFrame, filters) -> pd.DataFrame:
+    """
+    filters berisi tuple (kolom, operator, nilai). Nilai boleh berupa angka
+    atau nama kolom lain, misalnya ("Now", ">", "MA200"). Semua filter digabung dengan AND.
+    """
+    mask = np.ones(len(indicators), dtype=bool)
+    for column, op, value in filters:
+        left = indicators[column].to_numpy()
+        right = indicators[value].to_numpy() if isinstance(value, str) else value
+        with np.errstate(invalid="ignore"):
+            mask &= OPERATORS[op](left, right)
+    return indicators[mask]
@@ -0,0 +1,136 @@
+import os
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from itertools import count as _counter
+
+import pandas as pd
+
+# =========================================================
+# Cache bersama antar sesi (satu per proses Streamlit)
+# =========================================================
+DEFAULT_BUDGET_MB = float(os.environ.get("FIBER_CACHE_MB", 512))
+
+_versions = _counter(1)
+
+
+@dataclass
+class CacheEntry:
+    value: object
+    size: int
+    created_at: float
+    version: int
+
+
+def estimate_size(obj) -> int:
+    if isinstance(obj, pd.DataFrame):
+        return int(obj.memory_usage(deep=True).sum())
+    if isinstance(obj, pd.Series):
+        return int(obj.memory_usage(deep=True))
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sys.getsizeof(obj) + sum(estimate_size(v) for v in obj.values())
+    if isinstance(obj, (list, tuple)):
+        return sys.getsizeof(obj) + sum(estimate_size(v) for v in obj)
+    return sys.getsizeof(obj)
+
+
+def file_fingerprint(path: str) -> str:
+    # Berubah setiap kali Daftar Saham diunggah ulang
+    stat = os.stat(path)
+    return f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+
+
+class SharedCache:
+    """
+    Cache LRU dengan batas memori. Aman dipakai dari banyak thread sesi sekaligus;
+    hanya satu sesi yang menghitung nilai untuk key yang sama, sesi lain menunggu hasilnya.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self.stats = {"hits": 0, "misses": 0, "evictions": 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def get(self, key, max_age: float = None):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and max_age is not None and time.time() - entry.created_at > max_age:
+                entry = None
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self.stats["hits"] += 1
+            return entry
+
+    def put(self, key, value, size: int = None, created_at: float = None) -> CacheEntry:
+        # created_at bisa diisi waktu data itu sebenarnya dibuat (misalnya dari proses lain)
+        size = estimate_size(value) if size is None else size
+        created_at = time.time() if created_at is None else created_at
+        entry = CacheEntry(value, size, created_at, next(_versions))
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.current_bytes -= old.size
+            # Nilai yang lebih besar dari seluruh budget tidak disimpan
+            if size <= self.max_bytes:
+                self._entries[key] = entry
+                self.current_bytes += size
+                self._evict()
+        return entry
+
+    def get_or_compute(self, key, compute, max_age: float = None, created_at=None) -> CacheEntry:
+        """
+        created_at: fungsi opsional (nilai -> timestamp) untuk waktu pembuatan entry.
+        """
+        entry = self.get(key, max_age)
+        if entry is not None:
+            return entry
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        try:
+            with key_lock:
+                # Sesi lain mungkin sudah selesai menghitung selama kita menunggu
+                entry = self.get(key, max_age)
+                if entry is None:
+                    value = compute()
+                    entry = self.put(key, value, created_at=None if created_at is None else created_at(value))
+        finally:
+            # Lock per key tetap dibuang walau compute() gagal (misalnya fetch error)
+            with self._lock:
+                self._key_locks.pop(key, None)
+        return entry
+
+    def _evict(self):
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, entry = self._entries.popitem(last=False)
+            self.current_bytes -= entry.size
+            self.stats["evictions"] += 1
+
+    def info(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "used_mb": round(self.current_bytes / 1024 ** 2, 2),
+                "budget_mb": round(self.max_bytes / 1024 ** 2, 2),
+                **self.stats,
+            }
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache() -> SharedCache:
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = SharedCache(int(DEFAULT_BUDGET_MB * 1024 ** 2))
+    return _shared
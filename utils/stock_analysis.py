@@ -0,0 +1,217 @@
+import numpy as np
+import pandas as pd
+from io import BytesIO
+from utils import instrumentation, transport
+
+# =========================================================
+# 1. Fungsi utilitas
+# =========================================================
+STATUS_LABELS = ("Max", "Min", "Mean")
+STATUS_YEARS = (5, 3, 1)
+LATEST_BATCH_SIZE = 200
+MARKET_HOURS = ("09:00", "16:00")
+
+def load_stock_list(filepath: str) -> pd.DataFrame:
+    return pd.read_excel(filepath)
+
+def fetch_stock_data(kode_saham: pd.DataFrame, period: str = "6y", progress_callback=None) -> pd.DataFrame:
+    kode_list = (kode_saham['Kode'] + ".JK").to_list()
+    total = len(kode_list)
+    data_combined = pd.DataFrame()
+
+    for i, kode in enumerate(kode_list, 1):
+        try:
+            data = transport.yfinance_history(kode, period)['Close'].round()
+            data = data.to_frame(name=kode.replace(".JK", ""))
+            if data_combined.empty:
+                data_combined = data
+            else:
+                data_combined = data_combined.join(data, how='outer')
+        except Exception:
+            pass  # Lewati saham yang gagal diambil
+        if progress_callback:
+            progress_callback(i / total)
+
+    # Format tanggal agar lebih rapi (dd-mm-yyyy)
+    data_combined.index = data_combined.index.strftime("%d-%m-%Y")
+    instrumentation.count("rows_produced", len(data_combined))
+    return data_combined
+
+def fetch_latest_prices(kode_list, batch_size: int = LATEST_BATCH_SIZE) -> pd.Series:
+    """
+    Harga terakhir hari ini per kode saham (tanpa .JK), diambil per batch.
+    """
+    parts = []
+    for start in range(0, len(kode_list), batch_size):
+        batch = [f"{kode}.JK" for kode in kode_list[start:start + batch_size]]
+        try:
+            parts.append(transport.yfinance_latest(batch))
+        except Exception:
+            pass  # Lewati batch yang gagal diambil, harga lama tetap dipakai
+    if not parts:
+        return pd.Series(dtype="float64")
+    latest = pd.concat(parts)
+    latest.index = latest.index.str.replace(".JK", "", regex=False)
+    instrumentation.count("rows_produced", int(latest.notna().sum()))
+    return latest.round()
+
+def market_open(now: pd.Timestamp = None) -> bool:
+    # Jam perdagangan BEI (WIB), hari Senin-Jumat
+    now = now or pd.Timestamp.now(tz="Asia/Jakarta")
+    return now.dayofweek < 5 and MARKET_HOURS[0] <= now.strftime("%H:%M") < MARKET_HOURS[1]
+
+def filter_data_by_years(data: pd.DataFrame, years: int) -> pd.DataFrame:
+    # Konversi index kembali ke datetime untuk perhitungan
+    data.index = pd.to_datetime(data.index, format="%d-%m-%Y")
+    latest_date = data.index.max()
+    cutoff_date = latest_date - pd.DateOffset(years=years)
+    subset = data[data.index >= cutoff_date]
+    valid_cols = (
+        subset[subset.index.year == cutoff_date.year]
+        .dropna(axis=1, how="all")
+        .columns.to_list()
+    )
+    subset.index = subset.index.strftime("%d-%m-%Y")
+    return subset[valid_cols]
+
+def compute_statistics(data: pd.DataFrame, label: str) -> dict:
+    return {
+        f"Max {label}": data.max(),
+        f"Min {label}": data.min(),
+        f"Mean {label}": data.mean().round()
+    }
+
+def combine_with_current(data_stats: dict, harga_sekarang: pd.DataFrame) -> pd.DataFrame:
+    frames = [df.to_frame(name=col_name) for col_name, df in data_stats.items()]
+    combined = pd.concat(frames + [harga_sekarang], axis=1)
+    return combined
+
+def check_status(row, period_label: str):
+    now = row["Now"]
+    value_5 = row.get(f"{period_label} 5 Years")
+    value_3 = row.get(f"{period_label} 3 Years")
+    value_1 = row.get(f"{period_label} 1 Years")
+    if pd.notna(value_5) and now < value_5:
+        return f"Lower than 5 years {period_label.lower()}"
+    elif pd.notna(value_3) and now < value_3:
+        return f"Lower than 3 years {period_label.lower()}"
+    elif pd.notna(value_1) and now < value_1:
+        return f"Lower than 1 year {period_label.lower()}"
+    else:
+        return None
+
+
+# =========================================================
+# 2. Fungsi utama analisis
+# =========================================================
+def classify_status(stats: pd.DataFrame, period_label: str, now=None) -> np.ndarray:
+    """
+    Versi tervektorisasi dari check_status untuk semua saham sekaligus.
+    `now` boleh diganti (misalnya harga intraday); statistik window tetap dari stats.
+    """
+    now = stats["Now"].to_numpy(dtype="float64") if now is None else np.asarray(now, dtype="float64")
+    conditions, choices = [], []
+    for years in STATUS_YEARS:
+        column = f"{period_label} {years} Years"
+        if column not in stats:
+            continue
+        with np.errstate(invalid="ignore"):
+            conditions.append(now < stats[column].to_numpy(dtype="float64"))
+        suffix = "years" if years > 1 else "year"
+        choices.append(np.full(len(now), f"Lower than {years} {suffix} {period_label.lower()}", dtype=object))
+    return np.select(conditions, choices, default=None)
+
+def window_statistics(data: pd.DataFrame) -> pd.DataFrame:
+    """
+    Max/Min/Mean 1, 3 dan 5 tahun serta harga terakhir (Now) untuk setiap saham.
+    """
+    data_ff = data.ffill()
+    latest_date = pd.to_datetime(data_ff.index, format="%d-%m-%Y").max()
+    harga_sekarang = data_ff.loc[data_ff.index == latest_date.strftime("%d-%m-%Y")].T
+    harga_sekarang.columns = ["Now"]
+
+    with instrumentation.span("filter_data_by_years"):
+        data_1y = filter_data_by_years(data_ff.copy(), 1)
+        data_3y = filter_data_by_years(data_ff.copy(), 3)
+        data_5y = filter_data_by_years(data_ff.copy(), 5)
+
+    with instrumentation.span("compute_statistics"):
+        stats_1y = compute_statistics(data_1y, "1 Years")
+        stats_3y = compute_statistics(data_3y, "3 Years")
+        stats_5y = compute_statistics(data_5y, "5 Years")
+
+    frames = {}
+    for label in STATUS_LABELS:
+        frames.update({
+            f"{label} 1 Years": stats_1y[f"{label} 1 Years"],
+            f"{label} 3 Years": stats_3y[f"{label} 3 Years"],
+            f"{label} 5 Years": stats_5y[f"{label} 5 Years"],
+        })
+    return combine_with_current(frames, harga_sekarang)
+
+def status_tables(stats: pd.DataFrame, now: pd.Series = None) -> dict:
+    if now is not None:
+        stats = stats.assign(Now=now.reindex(stats.index))
+    result = {}
+    for label in STATUS_LABELS:
+        combined = stats[[f"{label} 1 Years", f"{label} 3 Years", f"{label} 5 Years", "Now"]].copy()
+        combined["Status"] = classify_status(combined, label)
+        combined = combined.dropna(subset=["Status"])
+        instrumentation.count("rows_produced", len(combined))
+        result[label] = combined
+    return result
+
+def analyze_data(data: pd.DataFrame):
+    return status_tables(window_statistics(data))
+
+
+# =========================================================
+# 3. Refresh intraday
+# =========================================================
+def merge_latest(now: pd.Series, latest: pd.Series) -> pd.Series:
+    # Saham tanpa quote baru tetap memakai harga sebelumnya
+    return latest.reindex(now.index).fillna(now)
+
+def status_delta(stats: pd.DataFrame, now_lama: pd.Series, now_baru: pd.Series) -> pd.DataFrame:
+    """
+    Saham yang status Max/Min/Mean-nya berubah antara dua harga Now.
+    Perubahan: Triggered (baru masuk), Cleared (keluar) atau Changed (pindah window).
+    """
+    lama_values = now_lama.reindex(stats.index).to_numpy(dtype="float64")
+    baru_values = now_baru.reindex(stats.index).to_numpy(dtype="float64")
+    rows = []
+    for label in STATUS_LABELS:
+        status_lama = classify_status(stats, label, lama_values)
+        status_baru = classify_status(stats, label, baru_values)
+        idx = np.flatnonzero(status_lama != status_baru)
+        if len(idx):
+            rows.append(pd.DataFrame({
+                "Kode": stats.index[idx],
+                "Tipe": label,
+                "Now Lama": lama_values[idx],
+                "Now": baru_values[idx],
+                "Status Lama": status_lama[idx],
+                "Status": status_baru[idx],
+            }))
+    columns = ["Kode", "Tipe", "Now Lama", "Now", "Status Lama", "Status", "Perubahan"]
+    if not rows:
+        return pd.DataFrame(columns=columns)
+    delta = pd.concat(rows, ignore_index=True)
+    delta["Perubahan"] = np.select(
+        [delta["Status Lama"].isna(), delta["Status"].isna()], ["Triggered", "Cleared"], default="Changed"
+    )
+    instrumentation.count("rows_produced", len(delta))
+    return delta[columns]
+
+
+# =========================================================
+# 4. Export
+# =========================================================
+def export_status_excel(analysis: dict) -> BytesIO:
+    buffer = BytesIO()
+    with pd.ExcelWriter(buffer, engine="xlsxwriter") as writer:
+        for label, df in analysis.items():
+            df.to_excel(writer, sheet_name=label)
+    instrumentation.count("bytes_written", buffer.tell())
+    buffer.seek(0)
+    return buffer
@@ -0,0 +1,175 @@
+"""
+Stub server lokal untuk memutar ulang response HTTP dari cassette.
+
+Bisa menyuntikkan latency, error 500 dan 429 agar perilaku retry, rate limit
+dan fetch paralel bisa diuji ulang secara offline:
+
+    python -m utils.stub_server --cassette database/http_cassette --port 8765 \\
+        --latency 0.2 --jitter 0.05 --error-rate 0.05 --rate-429 0.1 --max-rps 20
+
+Lalu jalankan aplikasi dengan FIBER_HTTP_MODE=replay dan
+FIBER_HTTP_STUB_URL=http://127.0.0.1:8765.
+"""
+import argparse
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from utils.transport import load_response
+
+
+def config_from_env() -> dict:
+    return {
+        "latency": float(os.environ.get("FIBER_STUB_LATENCY", 0)),
+        "jitter": float(os.environ.get("FIBER_STUB_JITTER", 0)),
+        "error_rate": float(os.environ.get("FIBER_STUB_ERROR_RATE", 0)),
+        "rate_429": float(os.environ.get("FIBER_STUB_429_RATE", 0)),
+        "max_rps": float(os.environ.get("FIBER_STUB_MAX_RPS", 0)),
+        "seed": int(os.environ.get("FIBER_STUB_SEED", 0)),
+    }
+
+
+class _ReplayHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        server = self.server
+        if not self.path.startswith("/replay/"):
+            self._send(404, b"unknown route", "text/plain")
+            return
+
+        key = self.path[len("/replay/"):].split("?")[0]
+        if not re.fullmatch(r"[0-9a-f]{40}", key):
+            self._send(404, b"invalid key", "text/plain")
+            return
+        delay, outcome = server.decide()
+        if delay > 0:
+            time.sleep(delay)
+
+        if outcome == 429:
+            self._send(429, b"Too Many Requests", "text/plain", {"Retry-After": "1"})
+            return
+        if outcome == 500:
+            self._send(500, b"Injected server error", "text/plain")
+            return
+
+        entry = load_response(key, server.cassette_dir)
+        if entry is None:
+            server.record_stat("missing")
+            self._send(404, f"Request {key} belum direkam".encode("utf-8"), "text/plain")
+            return
+        meta, body = entry
+        server.record_stat("served")
+        self._send(meta["status"], body, meta["content_type"])
+
+    def _send(self, status, body, content_type, extra_headers=None):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, cassette_dir, latency=0.0, jitter=0.0, error_rate=0.0,
+                 rate_429=0.0, max_rps=0.0, seed=0):
+        super().__init__(address, _ReplayHandler)
+        self.cassette_dir = cassette_dir
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_429 = rate_429
+        self.max_rps = max_rps
+        self.stats = {"requests": 0, "served": 0, "missing": 0, "429": 0, "500": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self._tokens = max_rps
+        self._last_refill = time.monotonic()
+
+    @property
+    def url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def record_stat(self, name):
+        with self._lock:
+            self.stats[name] += 1
+
+    def decide(self):
+        """
+        Tentukan delay dan hasil (None, 429 atau 500) untuk satu request.
+        RNG dan token bucket dijaga lock supaya hasilnya reproducible.
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            delay = max(0.0, self.latency + self._rng.uniform(-self.jitter, self.jitter))
+
+            outcome = None
+            if self.max_rps > 0:
+                now = time.monotonic()
+                self._tokens = min(self.max_rps, self._tokens + (now - self._last_refill) * self.max_rps)
+                self._last_refill = now
+                if self._tokens < 1:
+                    outcome = 429
+                else:
+                    self._tokens -= 1
+
+            roll = self._rng.random()
+            if outcome is None and roll < self.rate_429:
+                outcome = 429
+            elif outcome is None and roll < self.rate_429 + self.error_rate:
+                outcome = 500
+
+            if outcome is not None:
+                self.stats[str(outcome)] += 1
+            return delay, outcome
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+
+
+def start_stub_server(cassette_dir, host="127.0.0.1", port=0, **config) -> StubServer:
+    server = StubServer((host, port), cassette_dir, **config)
+    thread = threading.Thread(target=server.serve_forever, name="fiber-stub-server", daemon=True)
+    thread.start()
+    return server
+
+
+def main(argv=None):
+    defaults = config_from_env()
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--cassette", default=os.environ.get("FIBER_HTTP_CASSETTE", "database/http_cassette"))
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=defaults["latency"], help="detik per request")
+    parser.add_argument("--jitter", type=float, default=defaults["jitter"], help="variasi latency (+/- detik)")
+    parser.add_argument("--error-rate", type=float, default=defaults["error_rate"], help="peluang error 500")
+    parser.add_argument("--rate-429", type=float, default=defaults["rate_429"], help="peluang 429 acak")
+    parser.add_argument("--max-rps", type=float, default=defaults["max_rps"], help="batas request/detik, 0 = tanpa batas")
+    parser.add_argument("--seed", type=int, default=defaults["seed"])
+    args = parser.parse_args(argv)
+
+    server = StubServer((args.host, args.port), args.cassette, latency=args.latency, jitter=args.jitter,
+                        error_rate=args.error_rate, rate_429=args.rate_429, max_rps=args.max_rps,
+                        seed=args.seed)
+    print(f"Stub server berjalan di {server.url} (cassette: {args.cassette})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print(f"Statistik: {server.stats}")
+
+
+if __name__ == "__main__":
+    main()
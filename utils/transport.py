@@ -0,0 +1,207 @@
+import hashlib
+import json
+import os
+import threading
+from urllib.parse import urlencode
+
+import pandas as pd
+
+from utils import instrumentation
+
+# =========================================================
+# Lapisan transport HTTP: live, record, replay
+# =========================================================
+# live   : request langsung ke layanan aslinya (default)
+# record : request ke layanan asli, response disimpan ke cassette
+# replay : response dari cassette, dilayani lewat stub server lokal
+MODES = ("live", "record", "replay")
+
+_config = {
+    "mode": os.environ.get("FIBER_HTTP_MODE", "live").lower(),
+    "cassette_dir": os.environ.get("FIBER_HTTP_CASSETTE", "database/http_cassette"),
+    "stub_url": os.environ.get("FIBER_HTTP_STUB_URL"),
+}
+_stub_server = None
+_lock = threading.Lock()
+
+# Parameter yang nilainya berubah setiap hari (dihitung dari datetime.today()).
+# Tidak ikut ke key cassette, jadi rekaman tetap bisa di-replay di hari lain.
+VOLATILE_PARAMS = ("start_date", "end_date")
+
+
+def configure(mode: str = None, cassette_dir: str = None, stub_url: str = None):
+    if mode is not None:
+        if mode not in MODES:
+            raise ValueError(f"Mode transport tidak dikenal: {mode}. Pilihan: {MODES}")
+        _config["mode"] = mode
+    if cassette_dir is not None:
+        _config["cassette_dir"] = cassette_dir
+    if stub_url is not None:
+        _config["stub_url"] = stub_url
+
+
+def current_mode() -> str:
+    return _config["mode"]
+
+
+# =========================================================
+# Cassette
+# =========================================================
+def canonical_url(url: str, params: dict = None) -> str:
+    if not params:
+        return url
+    return f"{url}?{urlencode(sorted(params.items()))}"
+
+
+def request_key(url: str, params: dict = None) -> str:
+    stable = {k: v for k, v in (params or {}).items() if k not in VOLATILE_PARAMS}
+    return hashlib.sha1(canonical_url(url, stable).encode("utf-8")).hexdigest()
+
+
+def save_response(url, status_code, content: bytes, content_type=None, params=None, cassette_dir=None):
+    cassette_dir = cassette_dir or _config["cassette_dir"]
+    os.makedirs(cassette_dir, exist_ok=True)
+    key = request_key(url, params)
+    with open(os.path.join(cassette_dir, f"{key}.bin"), "wb") as f:
+        f.write(content)
+    meta = {
+        "url": canonical_url(url, params),
+        "status": status_code,
+        "content_type": content_type or "application/octet-stream",
+    }
+    with open(os.path.join(cassette_dir, f"{key}.json"), "w") as f:
+        json.dump(meta, f, indent=2)
+    return key
+
+
+def load_response(key: str, cassette_dir: str = None):
+    """
+    Kembalikan (meta, body) dari cassette, atau None jika belum direkam.
+    """
+    cassette_dir = cassette_dir or _config["cassette_dir"]
+    meta_path = os.path.join(cassette_dir, f"{key}.json")
+    if not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as f:
+        meta = json.load(f)
+    with open(os.path.join(cassette_dir, f"{key}.bin"), "rb") as f:
+        body = f.read()
+    return meta, body
+
+
+def _stub_base_url() -> str:
+    global _stub_server
+    if _config["stub_url"]:
+        return _config["stub_url"].rstrip("/")
+    # Tanpa FIBER_HTTP_STUB_URL, jalankan stub server di dalam proses ini
+    with _lock:
+        if _stub_server is None:
+            from utils.stub_server import start_stub_server, config_from_env
+            _stub_server = start_stub_server(_config["cassette_dir"], **config_from_env())
+    return _stub_server.url
+
+
+# =========================================================
+# Request
+# =========================================================
+def get(url, params=None, headers=None, timeout=None, stream=False, session=None):
+    """
+    Pengganti requests.get / session.get yang mengikuti mode transport aktif.
+    """
+    import requests
+
+    client = session or requests
+    mode = _config["mode"]
+    instrumentation.count("http_requests")
+
+    if mode == "replay":
+        key = request_key(url, params)
+        response = client.get(f"{_stub_base_url()}/replay/{key}", timeout=timeout, stream=stream)
+    else:
+        response = client.get(url, params=params, headers=headers, timeout=timeout,
+                              stream=stream and mode == "live")
+        if mode == "record":
+            save_response(url, response.status_code, response.content,
+                          response.headers.get("Content-Type"), params)
+
+    if not stream:
+        instrumentation.count("bytes_downloaded", len(response.content))
+    return response
+
+
+# =========================================================
+# Adapter yfinance
+# =========================================================
+def encode_history(history: pd.DataFrame) -> bytes:
+    # Index disimpan sebagai string beserta offset zona waktu (+07:00)
+    # agar tanggal bursa tidak bergeser saat dibaca ulang
+    payload = {
+        "index": [str(ts) for ts in history.index],
+        "columns": list(history.columns),
+        "data": history.values.tolist(),
+    }
+    return json.dumps(payload).encode("utf-8")
+
+
+def decode_history(content: bytes) -> pd.DataFrame:
+    payload = json.loads(content)
+    index = pd.to_datetime(payload["index"]) if payload["index"] else pd.DatetimeIndex([])
+    return pd.DataFrame(payload["data"], index=index, columns=payload["columns"])
+
+
+def yfinance_history(ticker: str, period: str) -> pd.DataFrame:
+    url = f"yfinance://history/{ticker}"
+    params = {"period": period}
+    mode = _config["mode"]
+
+    if mode == "replay":
+        response = get(url, params=params)
+        response.raise_for_status()
+        return decode_history(response.content)
+
+    import yfinance as yf
+    instrumentation.count("http_requests")
+    history = yf.Ticker(ticker).history(period=period)
+    if mode == "record":
+        save_response(url, 200, encode_history(history), "application/json", params)
+    return history
+
+
+def encode_latest(latest: pd.Series) -> bytes:
+    payload = {
+        "tickers": [str(t) for t in latest.index],
+        "prices": [None if pd.isna(v) else float(v) for v in latest.values],
+    }
+    return json.dumps(payload).encode("utf-8")
+
+
+def decode_latest(content: bytes) -> pd.Series:
+    payload = json.loads(content)
+    return pd.Series(payload["prices"], index=payload["tickers"], dtype="float64")
+
+
+def yfinance_latest(tickers: list) -> pd.Series:
+    """
+    Harga terakhir (bar 1 menit hari ini) untuk banyak ticker dalam satu request batch.
+    Ticker tanpa transaksi hari ini bernilai NaN.
+    """
+    url = "yfinance://latest"
+    params = {"tickers": ",".join(tickers)}
+    mode = _config["mode"]
+
+    if mode == "replay":
+        response = get(url, params=params)
+        response.raise_for_status()
+        return decode_latest(response.content)
+
+    import yfinance as yf
+    instrumentation.count("http_requests")
+    bars = yf.download(tickers, period="1d", interval="1m", group_by="column",
+                       auto_adjust=False, progress=False, threads=True)
+    if bars.empty:
+        latest = pd.Series(float("nan"), index=tickers)
+    else:
+        latest = bars["Close"].ffill().iloc[-1].reindex(tickers).astype("float64")
+    if mode == "record":
+        save_response(url, 200, encode_latest(latest), "application/json", params)
+    return latest
@@ -0,0 +1,126 @@
+import posixpath
+import re
+import zipfile
+from xml.etree import ElementTree
+
+from pandas._libs.parsers import STR_NA_VALUES
+
+# =========================================================
+# Pembaca sel xlsx ringan (langsung dari XML di dalam zip)
+# =========================================================
+# Hanya membaca nilai sel pada kolom yang diminta, tanpa membangun objek
+# workbook/cell openpyxl. Tipe nilai mengikuti read_excel: angka bulat
+# menjadi int, sel berformat tanggal menjadi datetime, sel error dan teks NA
+# bawaan pandas ("n/a", "NULL", "#N/A", ...) menjadi None.
+NS = {
+    "main": "http://schemas.openxmlformats.org/spreadsheetml/2006/main",
+    "rel": "http://schemas.openxmlformats.org/package/2006/relationships",
+}
+R_ID = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id"
+_CELL = f"{{{NS['main']}}}c"
+_VALUE = f"{{{NS['main']}}}v"
+_TEXT = f"{{{NS['main']}}}t"
+_REF = re.compile(r"([A-Z]+)(\d+)")
+
+
+def _column_index(letters: str) -> int:
+    index = 0
+    for ch in letters:
+        index = index * 26 + ord(ch) - 64
+    return index
+
+
+def _sheet_path(zf: zipfile.ZipFile, sheet_name: str) -> str:
+    workbook = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels.findall("rel:Relationship", NS)}
+    for sheet in workbook.iterfind("main:sheets/main:sheet", NS):
+        if sheet.get("name") == sheet_name:
+            target = targets[sheet.get(R_ID)]
+            return target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+    raise KeyError(f"Worksheet {sheet_name} does not exist.")
+
+
+def _shared_strings(zf: zipfile.ZipFile) -> list:
+    if "xl/sharedStrings.xml" not in zf.namelist():
+        return []
+    root = ElementTree.fromstring(zf.read("xl/sharedStrings.xml"))
+    return ["".join(t.text or "" for t in si.iter(_TEXT)) for si in root.iterfind("main:si", NS)]
+
+
+def _date_styles(zf: zipfile.ZipFile) -> set:
+    from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format
+
+    if "xl/styles.xml" not in zf.namelist():
+        return set()
+    root = ElementTree.fromstring(zf.read("xl/styles.xml"))
+    formats = dict(BUILTIN_FORMATS)
+    for fmt in root.iterfind("main:numFmts/main:numFmt", NS):
+        formats[int(fmt.get("numFmtId"))] = fmt.get("formatCode")
+    xfs = root.find("main:cellXfs", NS)
+    if xfs is None:
+        return set()
+    return {
+        i for i, xf in enumerate(xfs.iterfind("main:xf", NS))
+        if is_date_format(formats.get(int(xf.get("numFmtId", 0)), "General"))
+    }
+
+
+def _number(text: str):
+    value = float(text)
+    return int(value) if value.is_integer() else value
+
+
+def read_sheet_rows(file_path, sheet_name: str, max_col: int):
+    """
+    Kembalikan (rows, width): rows berisi tuple nilai kolom 1..max_col untuk
+    setiap baris mulai baris 1 (baris kosong tetap ada), width adalah kolom
+    terakhir yang berisi nilai di seluruh sheet.
+    """
+    with zipfile.ZipFile(file_path) as zf:
+        strings = _shared_strings(zf)
+        date_styles = _date_styles(zf)
+        with zf.open(_sheet_path(zf, sheet_name)) as sheet_xml:
+            rows, width = _parse_cells(sheet_xml, strings, date_styles, max_col)
+
+    last = max(rows, default=0)
+    return [tuple(rows.get(r, (None,) * max_col)) for r in range(1, last + 1)], width
+
+
+def _parse_cells(sheet_xml, strings: list, date_styles: set, max_col: int):
+    from openpyxl.utils.datetime import from_excel
+
+    rows, width = {}, 0
+    for _, cell in ElementTree.iterparse(sheet_xml):
+        if cell.tag != _CELL:
+            continue
+        ref = cell.get("r")
+        if ref is None:
+            raise ValueError("Sel tanpa atribut r tidak didukung")
+        col_letters, row_number = _REF.match(ref).groups()
+        col = _column_index(col_letters)
+        cell_type = cell.get("t", "n")
+        if cell_type == "inlineStr":
+            value = "".join(t.text or "" for t in cell.iter(_TEXT))
+        else:
+            raw = cell.findtext(_VALUE)
+            if raw is None or cell_type == "e":
+                value = None
+            elif cell_type == "s":
+                value = strings[int(raw)]
+            elif cell_type == "b":
+                value = raw == "1"
+            elif cell_type in ("str", "d"):
+                value = raw
+            elif int(cell.get("s", 0)) in date_styles:
+                value = from_excel(float(raw))
+            else:
+                value = _number(raw)
+        cell.clear()
+        if value is None or (isinstance(value, str) and value in STR_NA_VALUES):
+            continue
+        width = max(width, col)
+        if col <= max_col:
+            rows.setdefault(int(row_number), [None] * max_col)[col - 1] = value
+    return rows, width
+